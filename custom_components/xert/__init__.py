@@ -10,13 +10,43 @@ import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import async_get as async_get_device_registry
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, UPDATE_INTERVAL
-from .coordinator import XertDataUpdateCoordinator
+from .activity_cache import async_remove_activity_cache
+from .activity_streams import async_remove_stream_store
+from .api import XertApiError, async_get_session
+from .const import (
+    DEFAULT_DOWNLOAD_PARALLELISM,
+    DEFAULT_SEARCH_LIMIT,
+    DEFAULT_WORKOUT_DIR,
+    DOMAIN,
+    EVENT_WORKOUT_DOWNLOAD_PROGRESS,
+    MAX_DOWNLOAD_PARALLELISM,
+    MAX_FORECAST_DAYS,
+    MAX_SEARCH_LIMIT,
+    TRAINING_LOAD_FORECAST_DAYS,
+    UPDATE_INTERVAL,
+    WORKOUT_FORMATS,
+)
+from .coordinator import XertDataUpdateCoordinator, snapshot_store
+from .power_curve import power_curve_store
+from .polling import polling_bounds
+from .scheduler import async_get_scheduler
+from .statistics import XertStatistics
+from .training_load import training_load_store
+from .workout_cache import async_remove_workout_cache
+from .workout_files import resolve_config_path
+from .workout_library import WORKOUT_SORT_KEYS
 from .version import __version__
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,6 +56,9 @@ PLATFORMS: list[Platform] = [Platform.SENSOR]
 # Service schemas
 SERVICE_REFRESH_DATA = "refresh_data"
 SERVICE_DOWNLOAD_WORKOUT = "download_workout"
+SERVICE_DOWNLOAD_WORKOUTS = "download_workouts"
+SERVICE_SEARCH_WORKOUTS = "search_workouts"
+SERVICE_FORECAST_TRAINING_LOAD = "forecast_training_load"
 
 REFRESH_DATA_SCHEMA = vol.Schema(
     {
@@ -35,8 +68,71 @@ REFRESH_DATA_SCHEMA = vol.Schema(
 
 DOWNLOAD_WORKOUT_SCHEMA = vol.Schema(
     {
-        vol.Required("workout_id"): cv.string,
-        vol.Optional("format", default="zwo"): vol.In(["zwo", "erg"]),
+        vol.Required("workout_id"): cv.matches_regex(r"^[A-Za-z0-9_-]+$"),
+        vol.Optional("format", default="zwo"): vol.In(WORKOUT_FORMATS),
+        vol.Optional("entry_id"): cv.string,
+        vol.Optional("directory", default=DEFAULT_WORKOUT_DIR): cv.string,
+    }
+)
+
+DOWNLOAD_WORKOUTS_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Optional("workout_ids"): vol.All(
+                cv.ensure_list, [cv.matches_regex(r"^[A-Za-z0-9_-]+$")]
+            ),
+            vol.Optional("name"): cv.string,
+            vol.Optional("all"): cv.boolean,
+            vol.Optional("format", default="zwo"): vol.In(WORKOUT_FORMATS),
+            vol.Optional("entry_id"): cv.string,
+            vol.Optional("directory", default=DEFAULT_WORKOUT_DIR): cv.string,
+            vol.Optional(
+                "parallelism", default=DEFAULT_DOWNLOAD_PARALLELISM
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_DOWNLOAD_PARALLELISM)),
+        }
+    ),
+    cv.has_at_least_one_key("workout_ids", "name", "all"),
+)
+
+SEARCH_WORKOUTS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("query"): cv.string,
+        vol.Optional("type"): cv.string,
+        vol.Optional("min_difficulty"): vol.Coerce(float),
+        vol.Optional("max_difficulty"): vol.Coerce(float),
+        vol.Optional("min_duration"): cv.time_period,
+        vol.Optional("max_duration"): cv.time_period,
+        vol.Optional("modified_since"): cv.datetime,
+        vol.Optional("sort", default="name"): vol.In(list(WORKOUT_SORT_KEYS)),
+        vol.Optional("limit", default=DEFAULT_SEARCH_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_SEARCH_LIMIT)
+        ),
+        vol.Optional("entry_id"): cv.string,
+    }
+)
+
+FORECAST_TRAINING_LOAD_SCHEMA = vol.Schema(
+    {
+        vol.Optional("planned", default=list): vol.All(
+            cv.ensure_list,
+            [
+                vol.Schema(
+                    {
+                        vol.Required("day"): vol.All(
+                            vol.Coerce(int), vol.Range(min=0, max=MAX_FORECAST_DAYS)
+                        ),
+                        vol.Required("xss"): vol.All(
+                            vol.Coerce(float), vol.Range(min=0)
+                        ),
+                    }
+                )
+            ],
+        ),
+        vol.Optional("include_wotd", default=False): cv.boolean,
+        vol.Optional("days", default=TRAINING_LOAD_FORECAST_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_FORECAST_DAYS)
+        ),
+        vol.Optional("entry_id"): cv.string,
     }
 )
 
@@ -45,17 +141,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Xert from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    session = async_get_clientsession(hass)
+    session = async_get_session(hass)
     coordinator = XertDataUpdateCoordinator(
         hass,
         session,
         entry,
         UPDATE_INTERVAL,
+        async_get_scheduler(hass),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_restore_snapshot():
+        # Create the sensors from the snapshot and fetch live data in the background
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN}_first_refresh_{entry.entry_id}",
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    coordinator.async_schedule_token_refresh()
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
     # Create device for this integration
     _create_device(hass, entry, coordinator)
@@ -71,14 +178,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             if entry_id:
                 # Refresh specific entry
                 if entry_id in hass.data[DOMAIN]:
-                    await hass.data[DOMAIN][entry_id].async_request_refresh()
+                    await hass.data[DOMAIN][entry_id].async_request_full_refresh()
                     _LOGGER.info("Refreshed data for entry %s", entry_id)
                 else:
                     _LOGGER.error("Entry ID %s not found", entry_id)
             else:
-                # Refresh all entries
-                for coordinator in hass.data[DOMAIN].values():
-                    await coordinator.async_request_refresh()
+                # Refresh all entries concurrently, a limited number at a time
+                await async_get_scheduler(hass).async_run_limited(
+                    coordinator.async_request_full_refresh()
+                    for coordinator in hass.data[DOMAIN].values()
+                )
                 _LOGGER.info("Refreshed data for all Xert integrations")
 
         hass.services.async_register(
@@ -89,37 +198,153 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
 
     if not hass.services.has_service(DOMAIN, SERVICE_DOWNLOAD_WORKOUT):
-        async def handle_download_workout(call: ServiceCall) -> None:
+        async def handle_download_workout(call: ServiceCall) -> ServiceResponse:
             """Handle download workout service call."""
             workout_id = call.data["workout_id"]
-            format_type = call.data.get("format", "zwo")
-            
-            # Get the first coordinator (assuming single account)
-            coordinators = list(hass.data[DOMAIN].values())
-            if not coordinators:
-                _LOGGER.error("No Xert integration configured")
-                return
-            
-            coordinator = coordinators[0]
-            
+            format_type = call.data["format"]
+            coordinator = _get_coordinator(hass, call.data.get("entry_id"))
+            directory = resolve_config_path(hass, call.data["directory"])
+
             try:
-                workout_data = await coordinator.download_workout(workout_id, format_type)
-                _LOGGER.info(
-                    "Downloaded workout %s in %s format (%d bytes)",
-                    workout_id,
-                    format_type,
-                    len(workout_data),
+                workout_file = await coordinator.async_download_workout(
+                    workout_id, format_type, directory
                 )
-                # You can save to file or return data as needed
-                # For now, just log success
-            except Exception as err:
-                _LOGGER.error("Failed to download workout: %s", err)
+            except (XertApiError, OSError) as err:
+                raise HomeAssistantError(f"Failed to download workout: {err}") from err
+
+            _LOGGER.info(
+                "Downloaded workout %s in %s format to %s (%d bytes)",
+                workout_id,
+                format_type,
+                workout_file.path,
+                workout_file.size,
+            )
+            return workout_file.as_dict()
 
         hass.services.async_register(
             DOMAIN,
             SERVICE_DOWNLOAD_WORKOUT,
             handle_download_workout,
             schema=DOWNLOAD_WORKOUT_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_DOWNLOAD_WORKOUTS):
+        async def handle_download_workouts(call: ServiceCall) -> ServiceResponse:
+            """Handle bulk download workouts service call."""
+            coordinator = _get_coordinator(hass, call.data.get("entry_id"))
+            directory = resolve_config_path(hass, call.data["directory"])
+
+            # Explicit ids first, then the library workouts matching the filter
+            workout_ids = list(call.data.get("workout_ids", []))
+            if call.data.get("all") or call.data.get("name"):
+                workout_ids.extend(
+                    record.workout_id
+                    for record in coordinator.find_workouts(call.data.get("name"))
+                )
+            workout_ids = list(dict.fromkeys(workout_ids))
+
+            @callback
+            def _progress(finished: int, total: int, result: dict[str, Any]) -> None:
+                """Report the progress of the bulk download."""
+                hass.bus.async_fire(
+                    EVENT_WORKOUT_DOWNLOAD_PROGRESS,
+                    {
+                        "entry_id": coordinator.config_entry.entry_id,
+                        "finished": finished,
+                        "total": total,
+                        "workout_id": result["workout_id"],
+                        "success": result["success"],
+                    },
+                )
+
+            results = await coordinator.async_download_workouts(
+                workout_ids,
+                call.data["format"],
+                directory,
+                call.data["parallelism"],
+                _progress,
+            )
+            succeeded = sum(1 for result in results if result["success"])
+            _LOGGER.info(
+                "Downloaded %d of %d workouts to %s", succeeded, len(results), directory
+            )
+            return {
+                "total": len(results),
+                "succeeded": succeeded,
+                "failed": len(results) - succeeded,
+                "results": results,
+            }
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_DOWNLOAD_WORKOUTS,
+            handle_download_workouts,
+            schema=DOWNLOAD_WORKOUTS_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_SEARCH_WORKOUTS):
+        async def handle_search_workouts(call: ServiceCall) -> ServiceResponse:
+            """Handle search workouts service call."""
+            coordinator = _get_coordinator(hass, call.data.get("entry_id"))
+            min_duration = call.data.get("min_duration")
+            max_duration = call.data.get("max_duration")
+            modified_since = call.data.get("modified_since")
+
+            matches = coordinator.workout_library.search(
+                query=call.data.get("query"),
+                workout_type=call.data.get("type"),
+                min_difficulty=call.data.get("min_difficulty"),
+                max_difficulty=call.data.get("max_difficulty"),
+                min_duration=min_duration.total_seconds() if min_duration else None,
+                max_duration=max_duration.total_seconds() if max_duration else None,
+                modified_since=(
+                    dt_util.as_utc(modified_since).timestamp()
+                    if modified_since
+                    else None
+                ),
+                sort=call.data["sort"],
+            )
+            return {
+                "total": len(matches),
+                "workouts": [
+                    record.as_dict() for record in matches[: call.data["limit"]]
+                ],
+            }
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_SEARCH_WORKOUTS,
+            handle_search_workouts,
+            schema=SEARCH_WORKOUTS_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
+
+    if not hass.services.has_service(DOMAIN, SERVICE_FORECAST_TRAINING_LOAD):
+        async def handle_forecast_training_load(call: ServiceCall) -> ServiceResponse:
+            """Handle forecast training load service call."""
+            coordinator = _get_coordinator(hass, call.data.get("entry_id"))
+            planned: dict[int, float] = {}
+            for workout in call.data["planned"]:
+                planned[workout["day"]] = planned.get(workout["day"], 0) + workout["xss"]
+            if call.data["include_wotd"]:
+                wotd = coordinator.data.wotd if coordinator.data else None
+                if wotd is None or wotd.xss is None:
+                    raise HomeAssistantError("The workout of the day has no XSS")
+                planned[0] = planned.get(0, 0) + wotd.xss
+
+            forecast = await coordinator.async_forecast_training_load(
+                planned, call.data["days"]
+            )
+            return {"forecast": forecast}
+
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_FORECAST_TRAINING_LOAD,
+            handle_forecast_training_load,
+            schema=FORECAST_TRAINING_LOAD_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
         )
 
     return True
@@ -128,17 +353,56 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_unload()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the data stored for a config entry."""
+    await snapshot_store(hass, entry.entry_id).async_remove()
+    await power_curve_store(hass, entry.entry_id).async_remove()
+    await training_load_store(hass, entry.entry_id).async_remove()
+    await async_remove_activity_cache(hass, entry.entry_id)
+    await async_remove_stream_store(hass, entry.entry_id)
+    await async_remove_workout_cache(hass, entry.entry_id)
+    await XertStatistics(
+        hass, entry.entry_id, entry.data.get("username", "xert")
+    ).async_remove()
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed poll interval bounds without reloading the entry."""
+    if coordinator := hass.data.get(DOMAIN, {}).get(entry.entry_id):
+        coordinator.polling.set_bounds(*polling_bounds(entry.options))
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
     await async_setup_entry(hass, entry)
 
 
+def _get_coordinator(
+    hass: HomeAssistant, entry_id: str | None
+) -> XertDataUpdateCoordinator:
+    """Return the coordinator of an entry, or the only one if none is given."""
+    coordinators: dict[str, XertDataUpdateCoordinator] = hass.data.get(DOMAIN, {})
+    if entry_id:
+        if entry_id not in coordinators:
+            raise HomeAssistantError(f"Xert entry {entry_id} not found")
+        return coordinators[entry_id]
+
+    if not coordinators:
+        raise HomeAssistantError("No Xert integration configured")
+    if len(coordinators) > 1:
+        raise HomeAssistantError(
+            "Multiple Xert accounts configured, specify the entry_id to use"
+        )
+    return next(iter(coordinators.values()))
+
+
 def _create_device(
     hass: HomeAssistant,
     entry: ConfigEntry,
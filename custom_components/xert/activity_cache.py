@@ -0,0 +1,145 @@
+"""On-disk cache of Xert activity details."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.file import write_utf8_file_atomic
+
+from .const import ACTIVITY_CACHE_DIR, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ACTIVITY_CACHE = f"{DOMAIN}_activity_cache"
+
+
+def activity_cache_dir(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return the activity detail directory of a config entry."""
+    return Path(hass.config.path(ACTIVITY_CACHE_DIR, entry_id))
+
+
+@callback
+def async_get_activity_cache(
+    hass: HomeAssistant, entry_id: str
+) -> ActivityDetailCache:
+    """Return the activity detail cache of a config entry."""
+    caches = hass.data.setdefault(DATA_ACTIVITY_CACHE, {})
+    if (cache := caches.get(entry_id)) is None:
+        cache = caches[entry_id] = ActivityDetailCache(
+            hass, activity_cache_dir(hass, entry_id)
+        )
+    return cache
+
+
+async def async_remove_activity_cache(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the activity detail cache of a config entry."""
+    hass.data.get(DATA_ACTIVITY_CACHE, {}).pop(entry_id, None)
+    await hass.async_add_executor_job(
+        shutil.rmtree, activity_cache_dir(hass, entry_id), True
+    )
+
+
+class ActivityDetailCache:
+    """Write-once cache of activity details, one JSON file per activity.
+
+    A finished activity never changes, so its detail is downloaded once and
+    kept for good. Entries are never evicted or rewritten. Activities Xert
+    has no detail for are kept as empty marker files, so they are not
+    requested again either.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.directory = directory
+        self._keys: set[str] | None = None
+        self._unavailable: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def key(activity_path: str) -> str:
+        """Return the cache key of an activity."""
+        return hashlib.sha256(activity_path.encode()).hexdigest()
+
+    def path(self, key: str) -> Path:
+        """Return the file path of a cache entry."""
+        return self.directory / f"{key}.json"
+
+    def unavailable_path(self, key: str) -> Path:
+        """Return the file path of the marker of an activity without detail."""
+        return self.directory / f"{key}.unavailable"
+
+    async def async_missing(self, activity_paths: list[str]) -> list[str]:
+        """Return the activities whose detail is not cached yet."""
+        keys = await self._async_keys()
+        return [
+            path
+            for path in activity_paths
+            if (key := self.key(path)) not in keys and key not in self._unavailable
+        ]
+
+    async def async_load(self, activity_path: str) -> dict[str, Any] | None:
+        """Return the cached detail of an activity."""
+        key = self.key(activity_path)
+        if key not in await self._async_keys():
+            return None
+        try:
+            return await self.hass.async_add_executor_job(self._read, self.path(key))
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Dropping unreadable activity detail %s: %s", key, err)
+            self._keys.discard(key)
+            return None
+
+    async def async_save(self, activity_path: str, detail: dict[str, Any]) -> None:
+        """Store the detail of an activity."""
+        key = self.key(activity_path)
+        data = json.dumps(detail, separators=(",", ":"))
+        await self.hass.async_add_executor_job(self._write, self.path(key), data)
+        (await self._async_keys()).add(key)
+
+    async def async_save_unavailable(self, activity_path: str) -> None:
+        """Record that Xert has no detail for an activity."""
+        key = self.key(activity_path)
+        # Scan first, the scan replaces the markers known so far
+        await self._async_keys()
+        await self.hass.async_add_executor_job(
+            self._write, self.unavailable_path(key), ""
+        )
+        self._unavailable.add(key)
+
+    async def _async_keys(self) -> set[str]:
+        """Return the keys of the cached activities, scanning the directory once."""
+        if self._keys is None:
+            async with self._lock:
+                if self._keys is None:
+                    (
+                        self._keys,
+                        self._unavailable,
+                    ) = await self.hass.async_add_executor_job(self._scan)
+        return self._keys
+
+    def _scan(self) -> tuple[set[str], set[str]]:
+        """Return the keys of the details and markers in the cache directory."""
+        if not self.directory.is_dir():
+            return set(), set()
+        return (
+            {entry.stem for entry in self.directory.glob("*.json")},
+            {entry.stem for entry in self.directory.glob("*.unavailable")},
+        )
+
+    @staticmethod
+    def _read(path: Path) -> dict[str, Any]:
+        """Read a cache entry."""
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    @staticmethod
+    def _write(path: Path, data: str) -> None:
+        """Atomically write a cache entry."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_utf8_file_atomic(str(path), data)
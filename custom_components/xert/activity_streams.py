@@ -0,0 +1,235 @@
+"""Columnar on-disk storage of Xert activity sample streams."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    ACTIVITY_STREAM_DIR,
+    ACTIVITY_STREAM_SAVE_DELAY,
+    ACTIVITY_STREAM_STORAGE_VERSION,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_ACTIVITY_STREAMS = f"{DOMAIN}_activity_streams"
+
+# Stored columns and the sample keys they are read from. Every column is
+# float32 with NaN for missing samples, time is in seconds from the start
+STREAM_COLUMNS: dict[str, tuple[str, ...]] = {
+    "time": ("time", "timestamp", "seconds"),
+    "power": ("power", "watts"),
+    "heart_rate": ("heartrate", "heart_rate", "hr"),
+    "cadence": ("cadence", "cad"),
+    "speed": ("speed",),
+}
+COLUMN_INDEX = {column: index for index, column in enumerate(STREAM_COLUMNS)}
+STREAM_DTYPE = np.float32
+
+
+def activity_stream_dir(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return the activity stream directory of a config entry."""
+    return Path(hass.config.path(ACTIVITY_STREAM_DIR, entry_id))
+
+
+def activity_stream_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the activity stream index of a config entry."""
+    return Store(
+        hass, ACTIVITY_STREAM_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.activity_streams"
+    )
+
+
+@callback
+def async_get_stream_store(
+    hass: HomeAssistant, entry_id: str
+) -> ActivityStreamStore:
+    """Return the activity stream store of a config entry."""
+    stores = hass.data.setdefault(DATA_ACTIVITY_STREAMS, {})
+    if (store := stores.get(entry_id)) is None:
+        store = stores[entry_id] = ActivityStreamStore(
+            hass,
+            activity_stream_dir(hass, entry_id),
+            activity_stream_store(hass, entry_id),
+        )
+    return store
+
+
+async def async_remove_stream_store(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the activity stream store of a config entry."""
+    hass.data.get(DATA_ACTIVITY_STREAMS, {}).pop(entry_id, None)
+    await activity_stream_store(hass, entry_id).async_remove()
+    await hass.async_add_executor_job(
+        shutil.rmtree, activity_stream_dir(hass, entry_id), True
+    )
+
+
+def streams_from_samples(samples: list[dict[str, Any]]) -> np.ndarray:
+    """Convert the session samples of an activity into a column array.
+
+    Returns a (columns, samples) array, so every column is contiguous on
+    disk. Without a time column the samples are taken to be one second apart.
+    """
+    count = len(samples)
+    array = np.full((len(STREAM_COLUMNS), count), np.nan, dtype=STREAM_DTYPE)
+    for index, (column, keys) in enumerate(STREAM_COLUMNS.items()):
+        # The first samples may lack a field, such as power before the meter
+        # paired, so use the first key that has a value in any sample
+        key = next(
+            (
+                key
+                for key in keys
+                if any(sample.get(key) is not None for sample in samples)
+            ),
+            None,
+        )
+        if key is None:
+            continue
+        values = np.fromiter(
+            (_sample_value(sample.get(key)) for sample in samples),
+            dtype=np.float64,
+            count=count,
+        )
+        if column == "time" and not np.isnan(values).all():
+            # Store offsets, absolute timestamps do not fit float32 precisely
+            values -= np.nanmin(values)
+        array[index] = values
+
+    time = array[COLUMN_INDEX["time"]]
+    if np.isnan(time).all():
+        time[:] = np.arange(count, dtype=STREAM_DTYPE)
+    return array
+
+
+def _sample_value(value: Any) -> float:
+    """Return a sample value as a float, NaN if it is missing."""
+    try:
+        return float(value) if value is not None else np.nan
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class ActivityStreamStore:
+    """Store of activity streams, one memory-mapped NumPy file per activity.
+
+    Each activity is a .npy file holding a float32 (columns, samples) array.
+    Readers map the file and only touch the pages of the columns they use.
+    A small index store records the start time and sample count of every
+    activity, so analytics can select activities without opening files.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path, store: Store) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.directory = directory
+        self._store = store
+        self._index: dict[str, dict[str, Any]] | None = None
+        self._lock = asyncio.Lock()
+
+    def __contains__(self, activity_path: str) -> bool:
+        """Return whether the streams of an activity are stored."""
+        return self._index is not None and activity_path in self._index
+
+    async def async_load(self) -> None:
+        """Load the index of the store."""
+        if self._index is None:
+            async with self._lock:
+                if self._index is None:
+                    data = await self._store.async_load() or {}
+                    self._index = await self.hass.async_add_executor_job(
+                        self._existing, data.get("activities", {})
+                    )
+
+    async def async_add(
+        self, activity_path: str, start: int | None, streams: np.ndarray
+    ) -> None:
+        """Store the streams of an activity made by streams_from_samples."""
+        await self.async_load()
+        key = _file_key(activity_path)
+        await self.hass.async_add_executor_job(
+            self._write_streams, self.path(key), streams
+        )
+        self._index[activity_path] = {
+            "key": key,
+            "start": start,
+            "samples": streams.shape[1],
+        }
+        self._store.async_delay_save(self._data_to_save, ACTIVITY_STREAM_SAVE_DELAY)
+
+    def activities(
+        self, since: int | None = None, paths: Iterable[str] | None = None
+    ) -> dict[str, dict[str, Any]]:
+        """Return the index entries of the stored activities.
+
+        Activities can be limited to those starting at or after since, or to
+        the given paths.
+        """
+        index = self._index or {}
+        if paths is not None:
+            index = {path: index[path] for path in paths if path in index}
+        if since is not None:
+            index = {
+                path: entry
+                for path, entry in index.items()
+                if entry["start"] is not None and entry["start"] >= since
+            }
+        return index
+
+    def path(self, key: str) -> Path:
+        """Return the file path of the streams of an activity."""
+        return self.directory / f"{key}.npy"
+
+    def read_columns(
+        self, activity_path: str, columns: Iterable[str]
+    ) -> dict[str, np.ndarray]:
+        """Return memory-mapped views of columns of an activity.
+
+        Blocking, must be called from the executor.
+        """
+        entry = (self._index or {})[activity_path]
+        array = np.load(self.path(entry["key"]), mmap_mode="r")
+        return {column: array[COLUMN_INDEX[column]] for column in columns}
+
+    def _write_streams(self, path: Path, streams: np.ndarray) -> None:
+        """Atomically write the streams of an activity."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with tmp_path.open("wb") as file:
+                np.save(file, streams, allow_pickle=False)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _existing(
+        self, index: dict[str, dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        """Return the entries of an index whose file exists."""
+        return {
+            path: entry
+            for path, entry in index.items()
+            if self.path(entry["key"]).is_file()
+        }
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the index to save."""
+        return {"activities": self._index}
+
+
+def _file_key(activity_path: str) -> str:
+    """Return the file name of an activity, safe for any activity path."""
+    return hashlib.sha256(activity_path.encode()).hexdigest()
@@ -0,0 +1,485 @@
+"""HTTP client for the Xert Online API."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, TypeVar
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    API_BASE_URL,
+    TOKEN_URL,
+    OAUTH_CLIENT_ID,
+    OAUTH_CLIENT_SECRET,
+    HTTP_POOL_LIMIT,
+    HTTP_POOL_LIMIT_PER_HOST,
+    HTTP_KEEPALIVE_TIMEOUT,
+    HTTP_CONNECT_TIMEOUT,
+    DEFAULT_TIMEOUT,
+    TOKEN_TIMEOUT,
+    DOWNLOAD_TIMEOUT,
+    DOWNLOAD_CHUNK_SIZE,
+    ENDPOINT_TIMEOUTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    DEFAULT_RETRY_ATTEMPTS,
+    ENDPOINT_RETRY_ATTEMPTS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    CIRCUIT_MAX_RESET_TIMEOUT,
+    DEFAULT_RETRY_AFTER,
+    JSON_EXECUTOR_MIN_BYTES,
+)
+from .executor import XertExecutorShutdown
+from .json_stream import JsonListStreamParser
+from .version import __version__
+
+if TYPE_CHECKING:
+    from .executor import XertExecutor
+    from .scheduler import XertRequestScheduler
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SESSION = f"{DOMAIN}_session"
+
+_T = TypeVar("_T")
+
+
+class XertApiError(Exception):
+    """Error communicating with the Xert API."""
+
+
+class XertAuthError(XertApiError):
+    """The Xert API rejected the credentials or refresh token."""
+
+
+class XertTokenRefreshError(XertAuthError):
+    """The refresh token was rejected, the account must be re-authenticated."""
+
+
+class XertRequestRejectedError(XertApiError):
+    """The Xert API rejected the request, retrying it will not help."""
+
+
+class XertCircuitOpenError(XertApiError):
+    """Requests are suspended because the Xert API keeps failing."""
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Retry policy with exponential backoff and full jitter."""
+
+    attempts: int = DEFAULT_RETRY_ATTEMPTS
+    base_delay: float = RETRY_BASE_DELAY
+    max_delay: float = RETRY_MAX_DELAY
+
+    def delay(self, retry: int) -> float:
+        """Return the delay in seconds before the given retry (0-based)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+RETRY_POLICIES = {
+    endpoint: RetryPolicy(attempts=attempts)
+    for endpoint, attempts in ENDPOINT_RETRY_ATTEMPTS.items()
+}
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class CircuitBreaker:
+    """Circuit breaker guarding the requests of a single account.
+
+    The breaker opens after a number of consecutive failed requests. While
+    open, requests are refused until the reset timeout has passed, after which
+    a single request is let through as a probe and the next probe waits for
+    another reset timeout. A successful probe closes the breaker; a failed one
+    doubles the reset timeout. Failures of other requests while open, such as
+    requests started before it opened, do not extend it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT.total_seconds(),
+        max_reset_timeout: float = CIRCUIT_MAX_RESET_TIMEOUT.total_seconds(),
+    ) -> None:
+        """Initialize the breaker."""
+        self._failure_threshold = failure_threshold
+        self._base_reset_timeout = reset_timeout
+        self._max_reset_timeout = max_reset_timeout
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_until: float | None = None
+        self._probing = False
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the breaker is open, even if a probe is allowed."""
+        return self._opened_until is not None
+
+    @property
+    def is_suspended(self) -> bool:
+        """Return True if requests are refused until the reset timeout passes."""
+        return self._opened_until is not None and time.monotonic() < self._opened_until
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be made now, taking the probe if open."""
+        if self._opened_until is None:
+            return True
+        now = time.monotonic()
+        if now < self._opened_until:
+            return False
+        # Half-open, this request is the only probe until the next reset timeout
+        self._opened_until = now + self._reset_timeout
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        """Record a successful request and close the breaker."""
+        if self._opened_until is not None:
+            _LOGGER.info("Xert API recovered, closing circuit breaker")
+        self._failures = 0
+        self._opened_until = None
+        self._probing = False
+        self._reset_timeout = self._base_reset_timeout
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the breaker if needed."""
+        self._failures += 1
+        if self._opened_until is not None:
+            if not self._probing:
+                return
+            # Failed probe, wait longer before the next one
+            self._probing = False
+            self._reset_timeout = min(self._reset_timeout * 2, self._max_reset_timeout)
+        elif self._failures < self._failure_threshold:
+            return
+
+        self._opened_until = time.monotonic() + self._reset_timeout
+        _LOGGER.warning(
+            "Xert API failed %d times in a row, suspending requests for %d seconds",
+            self._failures,
+            self._reset_timeout,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": "open" if self.is_open else "closed",
+            "consecutive_failures": self._failures,
+            "reset_timeout": self._reset_timeout,
+            "retry_in": max(0.0, self._opened_until - time.monotonic())
+            if self._opened_until is not None
+            else None,
+        }
+
+
+def _retry_after(headers: Any) -> float:
+    """Return the Retry-After delay of a response in seconds."""
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return DEFAULT_RETRY_AFTER
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+def _params_key(params: dict[str, Any] | None) -> tuple[Any, ...]:
+    """Return a hashable key for request parameters."""
+    return tuple(sorted(params.items())) if params else ()
+
+
+def _timeout(total: float) -> aiohttp.ClientTimeout:
+    """Return a client timeout with the given total budget."""
+    return aiohttp.ClientTimeout(total=total, connect=HTTP_CONNECT_TIMEOUT)
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return the HTTP session shared by every Xert config entry and flow.
+
+    The session owns a pooled connector so connections (and their TLS
+    handshakes) are reused across accounts, polls and config flows.
+    """
+    session: aiohttp.ClientSession | None = hass.data.get(DATA_SESSION)
+    if session is not None and not session.closed:
+        return session
+
+    connector = aiohttp.TCPConnector(
+        limit=HTTP_POOL_LIMIT,
+        limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=300,
+    )
+    session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=_timeout(DEFAULT_TIMEOUT),
+        headers={"User-Agent": f"HomeAssistant-Xert/{__version__}"},
+    )
+    hass.data[DATA_SESSION] = session
+
+    async def _async_close_session(event: Event) -> None:
+        """Close the shared session when Home Assistant stops."""
+        await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    return session
+
+
+async def async_request_token(
+    session: aiohttp.ClientSession, data: dict[str, Any]
+) -> dict[str, Any]:
+    """Request an OAuth token using a password or refresh token grant."""
+    try:
+        async with session.post(
+            TOKEN_URL,
+            data=data,
+            auth=aiohttp.BasicAuth(OAUTH_CLIENT_ID, OAUTH_CLIENT_SECRET),
+            timeout=_timeout(TOKEN_TIMEOUT),
+        ) as response:
+            if response.status in (400, 401):
+                response_text = await response.text()
+                raise XertAuthError(
+                    f"Token request rejected with {response.status}: {response_text}"
+                )
+
+            if response.status != 200:
+                response_text = await response.text()
+                raise XertApiError(
+                    f"Token request failed with status {response.status}: {response_text}"
+                )
+
+            return await response.json()
+
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        raise XertApiError(f"Network error during token request: {err}") from err
+
+
+class XertApiClient:
+    """Authenticated Xert API client for a single account.
+
+    Every error is raised as XertApiError, refresh_access_token must only
+    raise XertApiError as well.
+    """
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        get_access_token: Callable[[], str | None],
+        refresh_access_token: Callable[[str | None], Awaitable[None]],
+        scheduler: XertRequestScheduler,
+        executor: XertExecutor,
+    ) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._scheduler = scheduler
+        self._executor = executor
+        self._inflight: dict[tuple[Any, ...], asyncio.Task] = {}
+        self._get_access_token = get_access_token
+        self._refresh_access_token = refresh_access_token
+        self.breaker = CircuitBreaker()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the in-flight requests when the config entry is unloaded."""
+        for task in list(self._inflight.values()):
+            task.cancel()
+        self._inflight.clear()
+
+    async def async_get_json(
+        self,
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> dict[str, Any]:
+        """Request an API endpoint and return the decoded JSON body."""
+        url = f"{API_BASE_URL}/{endpoint}"
+        if timeout is None:
+            timeout = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        policy = RETRY_POLICIES.get(endpoint, DEFAULT_RETRY_POLICY)
+        return await self._async_single_flight(
+            (url, _params_key(params)),
+            lambda: self._async_request(url, params, timeout, policy, self._read_json),
+        )
+
+    async def async_get_list(
+        self,
+        endpoint: str,
+        list_key: str,
+        item_factory: Callable[[Any], _T],
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """Request an API endpoint whose body holds one large list.
+
+        The body is parsed while it streams in and every element of the
+        list_key member is converted with item_factory as soon as it is
+        complete, so the raw elements are never held in memory together.
+        """
+        url = f"{API_BASE_URL}/{endpoint}"
+        timeout = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        policy = RETRY_POLICIES.get(endpoint, DEFAULT_RETRY_POLICY)
+
+        async def _read(response: aiohttp.ClientResponse) -> dict[str, Any]:
+            parser = JsonListStreamParser(list_key, item_factory)
+            try:
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    await self._executor.async_run(parser.feed, chunk)
+                return await self._executor.async_run(parser.close)
+            except ValueError as err:
+                raise XertApiError(f"Malformed response from {url}: {err}") from err
+
+        return await self._async_single_flight(
+            (url, _params_key(params), list_key),
+            lambda: self._async_request(url, params, timeout, policy, _read),
+        )
+
+    async def async_download(
+        self,
+        url: str,
+        reader: Callable[[aiohttp.ClientResponse], Awaitable[_T]],
+        key: Any = None,
+    ) -> _T:
+        """Download a file, handing the response to reader to consume its body.
+
+        Concurrent downloads with the same url and key share one request.
+        """
+        return await self._async_single_flight(
+            (url, key),
+            lambda: self._async_request(
+                url, None, DOWNLOAD_TIMEOUT, DEFAULT_RETRY_POLICY, reader, True
+            ),
+        )
+
+    async def _async_single_flight(
+        self, key: tuple[Any, ...], request: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Share one in-flight request between concurrent callers.
+
+        Callers must treat the shared result as read-only. The shared request
+        is cancelled by async_shutdown if it outlives the config entry.
+        """
+        if (task := self._inflight.get(key)) is None:
+            task = asyncio.get_running_loop().create_task(request())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._inflight_done(key, done))
+        else:
+            _LOGGER.debug("Joining in-flight request to %s", key[0])
+
+        # Shield the shared request so that a cancelled caller does not cancel
+        # it for the other callers
+        return await asyncio.shield(task)
+
+    def _inflight_done(self, key: tuple[Any, ...], task: asyncio.Task) -> None:
+        """Forget a finished in-flight request."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved in case every caller went away
+            task.exception()
+
+    async def _read_json(self, response: aiohttp.ClientResponse) -> Any:
+        """Read a JSON response body, decoding large bodies in the executor."""
+        body = await response.read()
+        try:
+            if len(body) < JSON_EXECUTOR_MIN_BYTES:
+                return json.loads(body)
+            return await self._executor.async_run(json.loads, body)
+        except ValueError as err:
+            raise XertApiError(f"Malformed response from {response.url}: {err}") from err
+
+    async def _async_request(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        timeout: float,
+        policy: RetryPolicy,
+        reader: Callable[[aiohttp.ClientResponse], Awaitable[Any]],
+        download: bool = False,
+    ) -> Any:
+        """Make a request, retrying transient failures with backoff."""
+        if not self.breaker.allow_request():
+            raise XertCircuitOpenError("Xert API requests are suspended")
+
+        last_error: Exception | None = None
+        for attempt in range(policy.attempts):
+            if attempt:
+                delay = policy.delay(attempt - 1)
+                _LOGGER.debug(
+                    "Retrying %s in %.1f seconds after error: %r", url, delay, last_error
+                )
+                await asyncio.sleep(delay)
+
+            try:
+                result = await self._async_request_once(
+                    url, params, timeout, reader, download
+                )
+            except aiohttp.ClientResponseError as err:
+                if err.status == 401:
+                    raise XertAuthError(f"Unauthorized request to {url}") from err
+                if err.status == 429:
+                    # Rate limited, hold back the requests of every account
+                    self._scheduler.pause(_retry_after(err.headers))
+                elif err.status < 500:
+                    # The API is reachable but rejected the request, do not retry
+                    self.breaker.record_success()
+                    raise XertRequestRejectedError(
+                        f"API request failed: {err}"
+                    ) from err
+                last_error = err
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                last_error = err
+            except XertExecutorShutdown as err:
+                # The config entry is being unloaded, do not retry
+                raise XertApiError(str(err)) from err
+            else:
+                self.breaker.record_success()
+                return result
+
+        if not (
+            isinstance(last_error, aiohttp.ClientResponseError)
+            and last_error.status == 429
+        ):
+            self.breaker.record_failure()
+        raise XertApiError(
+            f"API request failed after {policy.attempts} attempts: {last_error!r}"
+        ) from last_error
+
+    async def _async_request_once(
+        self,
+        url: str,
+        params: dict[str, Any] | None,
+        timeout: float,
+        reader: Callable[[aiohttp.ClientResponse], Awaitable[Any]],
+        download: bool = False,
+    ) -> Any:
+        """Make an authenticated GET request, refreshing the token on a 401."""
+        for attempt in range(2):
+            await self._scheduler.async_acquire(download)
+            access_token = self._get_access_token()
+            headers = {"Authorization": f"Bearer {access_token}"}
+            async with self._session.get(
+                url, headers=headers, params=params, timeout=_timeout(timeout)
+            ) as response:
+                if response.status != 401 or attempt:
+                    response.raise_for_status()
+                    return await reader(response)
+
+            # Token might be expired, refresh it unless another request already
+            # did, and try once more with the new token. The response is closed
+            # first so that its connection is free for the token request
+            _LOGGER.debug("Got 401 from %s, refreshing token", url)
+            await self._refresh_access_token(access_token)
@@ -5,23 +5,27 @@ import logging
 from datetime import timedelta
 from typing import Any
 
-import aiohttp
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.util import dt as dt_util
 
+from .api import XertApiError, XertAuthError, async_get_session, async_request_token
 from .const import (
     DOMAIN,
-    TOKEN_URL,
-    OAUTH_CLIENT_ID,
-    OAUTH_CLIENT_SECRET,
     CONF_ACCESS_TOKEN,
     CONF_REFRESH_TOKEN,
     CONF_EXPIRES_IN,
     CONF_TOKEN_EXPIRES_AT,
+    CONF_MIN_POLL_INTERVAL,
+    CONF_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL_RANGE,
+    MAX_POLL_INTERVAL_RANGE,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -32,6 +36,14 @@ class XertConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> XertOptionsFlow:
+        """Return the options flow."""
+        return XertOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -66,7 +78,10 @@ class XertConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     },
                 )
 
-            except aiohttp.ClientError as err:
+            except XertAuthError as err:
+                _LOGGER.error("Authentication error: %s", err)
+                errors["base"] = "invalid_auth"
+            except XertApiError as err:
                 _LOGGER.error("Connection error: %s", err)
                 errors["base"] = "cannot_connect"
             except Exception as err:
@@ -92,16 +107,7 @@ class XertConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             "password": password,
         }
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                TOKEN_URL,
-                data=data,
-                auth=aiohttp.BasicAuth(OAUTH_CLIENT_ID, OAUTH_CLIENT_SECRET),
-            ) as response:
-                if response.status != 200:
-                    raise Exception(f"Authentication failed: {response.status}")
-
-                return await response.json()
+        return await async_request_token(async_get_session(self.hass), data)
 
     async def async_step_reauth(self, entry_data: dict[str, Any]) -> FlowResult:
         """Handle reauth flow when token refresh fails."""
@@ -148,7 +154,10 @@ class XertConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
                 return self.async_abort(reason="reauth_successful")
 
-            except aiohttp.ClientError as err:
+            except XertAuthError as err:
+                _LOGGER.error("Authentication error during reauth: %s", err)
+                errors["base"] = "invalid_auth"
+            except XertApiError as err:
                 _LOGGER.error("Connection error during reauth: %s", err)
                 errors["base"] = "cannot_connect"
             except Exception as err:
@@ -167,4 +176,44 @@ class XertConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "username": self._reauth_entry.data[CONF_USERNAME],
             },
             errors=errors,
-        ) 
\ No newline at end of file
+        )
+
+
+class XertOptionsFlow(config_entries.OptionsFlow):
+    """Handle the polling options of a Xert account."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the poll interval bounds."""
+        errors = {}
+
+        if user_input is not None:
+            if user_input[CONF_MIN_POLL_INTERVAL] > user_input[CONF_MAX_POLL_INTERVAL]:
+                errors["base"] = "invalid_poll_interval"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = user_input or self.hass.config_entries.async_get_entry(
+            self.handler
+        ).options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_MIN_POLL_INTERVAL,
+                        default=options.get(
+                            CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(*MIN_POLL_INTERVAL_RANGE)),
+                    vol.Required(
+                        CONF_MAX_POLL_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(*MAX_POLL_INTERVAL_RANGE)),
+                }
+            ),
+            errors=errors,
+        )
@@ -6,6 +6,7 @@ DOMAIN = "xert"
 # API Configuration
 API_BASE_URL = "https://www.xertonline.com/oauth"
 TOKEN_URL = "https://www.xertonline.com/oauth/token"
+WORKOUT_DOWNLOAD_URL = "https://www.xertonline.com/oauth/workout-download"
 
 # API Endpoints
 ENDPOINT_TRAINING_INFO = "training_info"
@@ -14,6 +15,74 @@ ENDPOINT_ACTIVITY_LIST = "activity"
 ENDPOINT_WORKOUT_DETAIL = "workout"
 ENDPOINT_ACTIVITY_DETAIL = "activity"
 
+# HTTP client shared by all config entries and flows
+HTTP_POOL_LIMIT = 20
+HTTP_POOL_LIMIT_PER_HOST = 8
+HTTP_KEEPALIVE_TIMEOUT = 60
+HTTP_CONNECT_TIMEOUT = 10
+
+# Total request timeout budgets in seconds
+DEFAULT_TIMEOUT = 20
+TOKEN_TIMEOUT = 15
+DOWNLOAD_TIMEOUT = 60
+ACTIVITY_DETAIL_TIMEOUT = 60
+ENDPOINT_TIMEOUTS = {
+    ENDPOINT_TRAINING_INFO: 15,
+    ENDPOINT_ACTIVITY_LIST: 20,
+    ENDPOINT_WORKOUTS: 30,
+}
+
+# Workout downloads are streamed to this directory, relative to /config
+DEFAULT_WORKOUT_DIR = "xert/workouts"
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+WORKOUT_FORMATS = ["zwo", "erg"]
+
+# Bulk workout downloads
+DEFAULT_DOWNLOAD_PARALLELISM = 4
+MAX_DOWNLOAD_PARALLELISM = 8
+EVENT_WORKOUT_DOWNLOAD_PROGRESS = f"{DOMAIN}_workout_download_progress"
+
+# Workout library search
+DEFAULT_SEARCH_LIMIT = 50
+MAX_SEARCH_LIMIT = 500
+
+# Downloaded workout files are cached by workout id, format and last modified
+# time in a subdirectory of this directory per config entry, relative to
+# /config, evicting the least recently used files above the size cap
+WORKOUT_CACHE_DIR = "xert/cache/workouts"
+WORKOUT_CACHE_MAX_BYTES = 50 * 1024 * 1024
+
+# Retries of transient failures (network errors, timeouts and 5xx responses)
+# with exponential backoff and full jitter, delays in seconds
+RETRY_BASE_DELAY = 1
+RETRY_MAX_DELAY = 10
+DEFAULT_RETRY_ATTEMPTS = 3
+ENDPOINT_RETRY_ATTEMPTS = {
+    ENDPOINT_TRAINING_INFO: 3,
+    ENDPOINT_ACTIVITY_LIST: 3,
+    ENDPOINT_WORKOUTS: 2,
+}
+
+# Per-account circuit breaker: opens after this many consecutive failed
+# requests and lets a probe through after the reset timeout, which doubles
+# after every failed probe
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT = timedelta(minutes=5)
+CIRCUIT_MAX_RESET_TIMEOUT = timedelta(hours=1)
+
+# Requests of all accounts share one token bucket limiting the request rate
+# against the Xert API; a 429 pauses the bucket for the Retry-After period
+RATE_LIMIT_PER_MINUTE = 30
+RATE_LIMIT_BURST = 10
+# Workout file downloads have their own bucket, so bulk downloads neither
+# crawl at the poll rate nor starve the scheduled polls of every account
+DOWNLOAD_RATE_LIMIT_PER_MINUTE = 120
+DOWNLOAD_RATE_LIMIT_BURST = 8
+DEFAULT_RETRY_AFTER = 60
+
+# Maximum number of accounts refreshed at once by the refresh_data service
+REFRESH_CONCURRENCY = 4
+
 # OAuth Configuration
 OAUTH_CLIENT_ID = "xert_public"
 OAUTH_CLIENT_SECRET = "xert_public"
@@ -29,6 +98,130 @@ CONF_TOKEN_EXPIRES_AT = "token_expires_at"
 # Update intervals
 UPDATE_INTERVAL = timedelta(minutes=15)
 
+# Background token refresh: tokens are refreshed between one hour and one hour
+# plus jitter before they expire, and retried after a delay when that fails.
+# Updates only refresh the token themselves once it is about to expire.
+TOKEN_REFRESH_LEAD = timedelta(hours=1)
+TOKEN_REFRESH_JITTER = timedelta(minutes=15)
+TOKEN_REFRESH_RETRY = timedelta(minutes=5)
+TOKEN_EXPIRY_MARGIN = timedelta(minutes=2)
+
+# Per-endpoint refresh schedule. Each coordinator tick only requests the
+# endpoints that are due; the rest are served from the cached result for as
+# long as it stays within the endpoint's staleness budget.
+ENDPOINT_REFRESH_INTERVALS = {
+    ENDPOINT_TRAINING_INFO: timedelta(minutes=15),
+    ENDPOINT_ACTIVITY_LIST: timedelta(hours=1),
+    ENDPOINT_WORKOUTS: timedelta(hours=6),
+}
+ENDPOINT_MAX_AGE = {
+    ENDPOINT_TRAINING_INFO: timedelta(hours=1),
+    ENDPOINT_ACTIVITY_LIST: timedelta(hours=6),
+    ENDPOINT_WORKOUTS: timedelta(days=1),
+}
+
+# Activity sync: the first sync downloads this window, later syncs only ask
+# for activities newer than the newest one seen minus an overlap. Activities
+# are not always uploaded in start order (a head unit synced the next day, a
+# second device), so the overlap spans days and the whole initial window is
+# fetched again once a day to pick up anything uploaded even later
+ACTIVITY_INITIAL_SYNC = timedelta(days=30)
+ACTIVITY_SYNC_OVERLAP = timedelta(days=3)
+ACTIVITY_RECONCILE_INTERVAL = timedelta(days=1)
+ACTIVITY_HISTORY_MAX = 500
+
+# Activity details (summary metrics and sample streams) are downloaded once
+# per activity into a subdirectory of this directory per config entry,
+# relative to /config
+ACTIVITY_CACHE_DIR = "xert/activities"
+ACTIVITY_DETAIL_PARALLELISM = 2
+# Details that failed to download are retried with a doubling delay
+ACTIVITY_DETAIL_RETRY_DELAY = timedelta(hours=1)
+ACTIVITY_DETAIL_MAX_RETRY_DELAY = timedelta(days=7)
+
+# Sample streams of activities are split off the details and stored as
+# memory-mapped NumPy files in a subdirectory of this directory per config
+# entry, relative to /config. Their index is a store saved with a delay, so
+# a backfill of many activities does not rewrite it for every activity
+ACTIVITY_STREAM_DIR = "xert/streams"
+ACTIVITY_STREAM_STORAGE_VERSION = 1
+ACTIVITY_STREAM_SAVE_DELAY = 10
+
+# Mean-maximal power curves: best average power over each duration of the
+# grid in seconds, all time and over rolling windows. The sensor state is the
+# all-time best 20 minute power
+MMP_DURATIONS = (
+    1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 12, 15, 20, 30, 45,
+    60, 90, 120, 150, 180, 240, 300, 360, 480, 600, 720, 900,
+    1200, 1500, 1800, 2400, 2700, 3600, 4500, 5400, 7200,
+    9000, 10800, 14400, 18000, 21600,
+)
+MMP_MAX_SECONDS = 24 * 3600
+POWER_CURVE_WINDOWS = {
+    "last_30_days": timedelta(days=30),
+    "last_90_days": timedelta(days=90),
+}
+POWER_CURVE_STATE_DURATION = 1200
+POWER_CURVE_STORAGE_VERSION = 1
+POWER_CURVE_SAVE_DELAY = 10
+
+# Three-parameter power-duration model P(t) = CP + W' / (t + tau), fitted to
+# the power curve points between these durations in seconds, searching tau
+# over a log-spaced grid
+POWER_MODEL_MIN_DURATION = 1
+POWER_MODEL_MAX_DURATION = 1800
+POWER_MODEL_MIN_POINTS = 6
+POWER_MODEL_TAU_RANGE = (0.5, 300)
+POWER_MODEL_TAU_STEPS = 256
+
+# Local training load: daily XSS averaged exponentially over these time
+# constants in days. Form is training load minus fatigue
+TRAINING_LOAD_DAYS = 42
+FATIGUE_DAYS = 7
+EWMA_BLOCK_DAYS = 365
+TRAINING_LOAD_HISTORY_DAYS = 42
+TRAINING_LOAD_FORECAST_DAYS = 7
+MAX_FORECAST_DAYS = 90
+TRAINING_LOAD_STORAGE_VERSION = 1
+TRAINING_LOAD_SAVE_DELAY = 10
+
+# CPU-heavy work (large JSON bodies, stream conversion and analytics) runs in
+# the executor, at most this many jobs per account at a time. JSON bodies
+# smaller than this are decoded on the event loop, where it is cheaper
+EXECUTOR_CONCURRENCY = 2
+JSON_EXECUTOR_MIN_BYTES = 256 * 1024
+
+# Adaptive polling: activity starts of the last weeks are binned by local hour
+# of the week, each covering the hours of a ride and its upload. Hours where
+# activities are expected at least this often per week, and the time after a
+# new activity is seen, poll at the minimum interval; the rest backs off to the
+# maximum. Intervals are in minutes and can be changed in the options
+CONF_MIN_POLL_INTERVAL = "min_poll_interval"
+CONF_MAX_POLL_INTERVAL = "max_poll_interval"
+DEFAULT_MIN_POLL_INTERVAL = 5
+DEFAULT_MAX_POLL_INTERVAL = 60
+MIN_POLL_INTERVAL_RANGE = (1, 60)
+MAX_POLL_INTERVAL_RANGE = (15, 720)
+POLL_PROFILE_WEEKS = 12
+POLL_UPLOAD_WINDOW_HOURS = 3
+POLL_ACTIVE_RATE = 0.25
+POLL_MIN_ACTIVITIES = 5
+POLL_BOOST = timedelta(hours=1)
+
+# Long-term statistics in the recorder. On the first run the activity list of
+# this window is fetched once to backfill the history from before the install
+STATISTICS_BACKFILL = timedelta(days=365)
+STATISTICS_STORAGE_VERSION = 1
+STATISTICS_SAVE_DELAY = 10
+
+# Snapshot of the last processed data, used to create the sensors on startup
+# without waiting for the API. Bump SNAPSHOT_VERSION whenever the layout of
+# the processed data changes so that incompatible snapshots are discarded.
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_VERSION = 5
+SNAPSHOT_MAX_AGE = timedelta(days=2)
+SNAPSHOT_SAVE_DELAY = 10
+
 # Entity names
 SENSOR_FITNESS_STATUS = "fitness_status"
 SENSOR_TRAINING_PROGRESS = "training_progress"
@@ -36,6 +229,21 @@ SENSOR_WORKOUT_MANAGER = "workout_manager"
 SENSOR_RECENT_ACTIVITY = "recent_activity"
 SENSOR_TOKEN_STATUS = "token_status"
 SENSOR_WOTD = "wotd"
+SENSOR_POWER_CURVE = "power_curve"
+SENSOR_POWER_MODEL = "power_model"
+SENSOR_TRAINING_LOAD = "training_load"
+SENSOR_SIGNATURE_FTP = "signature_ftp"
+SENSOR_SIGNATURE_LTP = "signature_ltp"
+SENSOR_SIGNATURE_HIE = "signature_hie"
+SENSOR_SIGNATURE_PP = "signature_pp"
+SENSOR_TL_LOW = "tl_low"
+SENSOR_TL_HIGH = "tl_high"
+SENSOR_TL_PEAK = "tl_peak"
+SENSOR_TL_TOTAL = "tl_total"
+SENSOR_TARGET_XSS_LOW = "target_xss_low"
+SENSOR_TARGET_XSS_HIGH = "target_xss_high"
+SENSOR_TARGET_XSS_PEAK = "target_xss_peak"
+SENSOR_TARGET_XSS_TOTAL = "target_xss_total"
 
 # Default values
 DEFAULT_NAME = "Xert Online" 
\ No newline at end of file
@@ -3,35 +3,174 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
+from dataclasses import dataclass, replace
 from datetime import datetime, timedelta
+from pathlib import Path
+from collections.abc import Callable
 from typing import Any
 
 import aiohttp
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
 
+from .api import (
+    XertApiClient,
+    XertApiError,
+    XertAuthError,
+    XertCircuitOpenError,
+    XertRequestRejectedError,
+    XertTokenRefreshError,
+    async_request_token,
+)
 from .const import (
     DOMAIN,
-    API_BASE_URL,
-    TOKEN_URL,
+    WORKOUT_DOWNLOAD_URL,
     ENDPOINT_TRAINING_INFO,
     ENDPOINT_WORKOUTS,
     ENDPOINT_ACTIVITY_LIST,
+    ENDPOINT_ACTIVITY_DETAIL,
+    ENDPOINT_REFRESH_INTERVALS,
+    ENDPOINT_MAX_AGE,
+    ACTIVITY_INITIAL_SYNC,
+    ACTIVITY_SYNC_OVERLAP,
+    ACTIVITY_RECONCILE_INTERVAL,
+    ACTIVITY_HISTORY_MAX,
+    ACTIVITY_DETAIL_PARALLELISM,
+    ACTIVITY_DETAIL_TIMEOUT,
+    ACTIVITY_DETAIL_RETRY_DELAY,
+    ACTIVITY_DETAIL_MAX_RETRY_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+    SNAPSHOT_VERSION,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    STATISTICS_BACKFILL,
+    TOKEN_REFRESH_LEAD,
+    TOKEN_REFRESH_JITTER,
+    TOKEN_REFRESH_RETRY,
+    TOKEN_EXPIRY_MARGIN,
+    TRAINING_LOAD_HISTORY_DAYS,
+    WORKOUT_FORMATS,
     CONF_ACCESS_TOKEN,
     CONF_REFRESH_TOKEN,
     CONF_EXPIRES_IN,
     CONF_TOKEN_EXPIRES_AT,
-    OAUTH_CLIENT_ID,
-    OAUTH_CLIENT_SECRET,
 )
+from .executor import XertExecutor, XertExecutorShutdown
+from .models import (
+    FitnessStatus,
+    PowerCurve,
+    PowerModel,
+    RecentActivity,
+    Signature,
+    TokenStatus,
+    TrainingLoad,
+    TrainingProgress,
+    WorkoutOfTheDay,
+    WorkoutFile,
+    WorkoutRecord,
+    WorkoutSummary,
+    XertData,
+    XssBreakdown,
+)
+from .activity_cache import ActivityDetailCache, async_get_activity_cache
+from .activity_streams import (
+    ActivityStreamStore,
+    async_get_stream_store,
+    streams_from_samples,
+)
+from .power_curve import PowerCurveTracker
+from .power_model import PowerModelFitter, power_model
+from .training_load import (
+    TrainingLoadTracker,
+    training_load_forecast,
+    training_load_history,
+    training_load_summary,
+)
+from .polling import PollingSchedule, polling_bounds
+from .scheduler import XertRequestScheduler
+from .statistics import XertStatistics
+from .workout_cache import async_get_workout_cache
+from .workout_files import async_copy_file, async_write_response
+from .workout_library import WorkoutLibrary
 
 _LOGGER = logging.getLogger(__name__)
 
+# Allow an endpoint to be refreshed slightly early so that small drifts in the
+# coordinator tick do not push it back by a whole update interval
+SCHEDULE_TOLERANCE = timedelta(seconds=30)
+
+
+@dataclass
+class EndpointCache:
+    """Refresh schedule and last fetched result of a single API endpoint."""
+
+    interval: timedelta
+    max_age: timedelta
+    data: dict | None = None
+    fetched_at: datetime | None = None
+    stale: bool = False
+
+    def is_due(self, now: datetime) -> bool:
+        """Return True if the endpoint should be requested on this tick."""
+        if self.data is None or self.fetched_at is None or self.stale:
+            return True
+        return now - self.fetched_at >= self.interval - SCHEDULE_TOLERANCE
+
+    def is_fresh(self, now: datetime) -> bool:
+        """Return True if the cached result is within its staleness budget."""
+        if self.data is None or self.fetched_at is None:
+            return False
+        return now - self.fetched_at < self.max_age
+
+
+def _xss_breakdown(data: dict) -> XssBreakdown:
+    """Build an XSS breakdown from a low/high/peak/total dict."""
+    return XssBreakdown(
+        low=data.get("low"),
+        high=data.get("high"),
+        peak=data.get("peak"),
+        total=data.get("total"),
+    )
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the data snapshot of a config entry."""
+    return Store(hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot")
+
+
+def activity_timestamp(activity: dict) -> int | None:
+    """Return the start time of an activity as a UNIX timestamp."""
+    start_date = activity.get("start_date") or {}
+    if start_date.get("timestamp") is not None:
+        return int(start_date["timestamp"])
 
-class XertDataUpdateCoordinator(DataUpdateCoordinator):
+    date = start_date.get("date")
+    if not date:
+        return None
+    try:
+        start = datetime.fromisoformat(date)
+    except ValueError:
+        return None
+    if start.tzinfo is None:
+        start = start.replace(
+            tzinfo=dt_util.get_time_zone(start_date.get("timezone") or "UTC")
+            or dt_util.UTC
+        )
+    return int(start.timestamp())
+
+
+def _activity_key(activity: dict) -> str:
+    """Return a stable key identifying an activity."""
+    return activity.get("path") or f"{activity.get('name')}@{activity_timestamp(activity)}"
+
+
+class XertDataUpdateCoordinator(DataUpdateCoordinator[XertData]):
     """Class to manage fetching Xert data API."""
 
     def __init__(
@@ -40,6 +179,7 @@ class XertDataUpdateCoordinator(DataUpdateCoordinator):
         session: aiohttp.ClientSession,
         config_entry: ConfigEntry,
         update_interval: timedelta,
+        scheduler: XertRequestScheduler,
     ) -> None:
         """Initialize."""
         self.session = session
@@ -48,8 +188,67 @@ class XertDataUpdateCoordinator(DataUpdateCoordinator):
         self._access_token = config_entry.data.get(CONF_ACCESS_TOKEN)
         self._refresh_token = config_entry.data.get(CONF_REFRESH_TOKEN)
         self._token_expires = None
-        self._refresh_lock = asyncio.Lock()
-        self._is_refreshing = False
+        self._refresh_task: asyncio.Task | None = None
+        self._unsub_token_refresh: CALLBACK_TYPE | None = None
+        self._unloaded = False
+        self.scheduler = scheduler
+        self.executor = XertExecutor(hass)
+        self.client = XertApiClient(
+            session,
+            lambda: self._access_token,
+            self._async_refresh_rejected_token,
+            scheduler,
+            self.executor,
+        )
+        # Offset the polls of this account by a stable phase so that accounts
+        # set up together do not all poll at the same instant
+        self._phase_offset = scheduler.phase_offset(
+            config_entry.entry_id, update_interval
+        )
+        self._phase_applied = False
+        # Poll faster around the athlete's usual upload times
+        self.polling = PollingSchedule(
+            update_interval,
+            *polling_bounds(config_entry.options),
+            self._phase_offset,
+        )
+        self._force_full_refresh = False
+        self.last_successful_call: datetime | None = None
+        self._activity_history: list[dict] = []
+        self._activity_high_water: int | None = None
+        self._activity_reconciled_at: datetime | None = None
+        # Deleted activities still to be removed from the analyses
+        self._removed_activities: set[str] = set()
+        self._snapshot_dirty = False
+        self._snapshot_saved_at: datetime | None = None
+        self.workout_library = WorkoutLibrary()
+        self._prefetched_wotd: str | None = None
+        self._prefetch_task: asyncio.Task | None = None
+        self._detail_task: asyncio.Task | None = None
+        # Retry delay and next attempt of activity details that failed
+        self._detail_retries: dict[str, tuple[timedelta, datetime]] = {}
+        self.power_curves = PowerCurveTracker(
+            hass, config_entry.entry_id, self.executor
+        )
+        self._power_curve = PowerCurve()
+        self.power_model = PowerModelFitter()
+        self._power_model = PowerModel()
+        self.training_load = TrainingLoadTracker(hass, config_entry.entry_id)
+        self._training_load = TrainingLoad()
+        self.statistics = XertStatistics(
+            hass, config_entry.entry_id, config_entry.data.get("username", "xert")
+        )
+        self._recorded_training_load: TrainingLoad | None = None
+        self._store = snapshot_store(hass, config_entry.entry_id)
+        self._endpoints = {
+            endpoint: EndpointCache(interval, ENDPOINT_MAX_AGE[endpoint])
+            for endpoint, interval in ENDPOINT_REFRESH_INTERVALS.items()
+        }
+        self._fetchers = {
+            ENDPOINT_TRAINING_INFO: self._fetch_training_info,
+            ENDPOINT_WORKOUTS: self._fetch_workouts,
+            ENDPOINT_ACTIVITY_LIST: self._fetch_recent_activities,
+        }
         
         # Load token expiry from stored timestamp or calculate from expires_in
         if config_entry.data.get(CONF_TOKEN_EXPIRES_AT):
@@ -68,34 +267,202 @@ class XertDataUpdateCoordinator(DataUpdateCoordinator):
             update_interval=update_interval,
         )
 
-    async def _async_update_data(self) -> dict[str, Any]:
+    async def _async_update_data(self) -> XertData:
+        """Fetch data from API endpoints and schedule the next poll."""
+        try:
+            return await self._async_fetch_data()
+        finally:
+            # After the fetch, so that activities seen by it are taken into account
+            self.update_interval = self._next_update_interval()
+
+    async def _async_fetch_data(self) -> XertData:
         """Fetch data from API endpoints."""
+        if self.data is not None and self.client.breaker.is_suspended:
+            # The API keeps failing, serve the last good data until the next probe
+            _LOGGER.debug("Xert API circuit breaker is open, serving cached data")
+            return self.data
+
         try:
             # Check if token needs refresh
             await self._ensure_valid_token()
 
-            # Fetch all data concurrently for efficiency
-            tasks = [
-                self._fetch_training_info(),
-                self._fetch_workouts(),
-                self._fetch_recent_activities(),
+            # Only request the endpoints that are due, concurrently
+            now = dt_util.utcnow()
+            force = self._force_full_refresh
+            self._force_full_refresh = False
+            due = [
+                endpoint
+                for endpoint, cache in self._endpoints.items()
+                if force or cache.is_due(now)
             ]
+            _LOGGER.debug("Refreshing endpoints: %s", ", ".join(due) or "none")
+            await asyncio.gather(
+                *(self._refresh_endpoint(endpoint, now) for endpoint in due)
+            )
 
-            training_info, workouts, activities = await asyncio.gather(*tasks)
+            # Merge fresh results with the cached results of the other endpoints
+            training_info = self._endpoints[ENDPOINT_TRAINING_INFO].data
+            workouts = self._endpoints[ENDPOINT_WORKOUTS].data
+            activities = self._endpoints[ENDPOINT_ACTIVITY_LIST].data
+
+            self.last_successful_call = now
 
             # Organize data into entity structure
-            return {
-                "fitness_status": self._process_fitness_status(training_info),
-                "training_progress": self._process_training_progress(training_info, activities),
-                "workout_manager": self._process_workout_manager(workouts),
-                "recent_activity": self._process_recent_activity(activities),
-                "token_status": self._process_token_status(),
-                "wotd": self._process_wotd(training_info),
-            }
+            training_progress = self._process_training_progress(
+                training_info, activities
+            )
+            self.statistics.async_record_training_progress(training_progress, now)
+            data = XertData(
+                fitness_status=self._process_fitness_status(training_info),
+                training_progress=training_progress,
+                workout_manager=self._process_workout_manager(workouts),
+                recent_activity=self._process_recent_activity(activities),
+                token_status=self._process_token_status(),
+                wotd=self._process_wotd(training_info),
+                power_curve=self._power_curve,
+                power_model=self._process_power_model(training_progress.signature),
+                training_load=self._training_load,
+            )
+            # Save the processed data once it has been applied, only when it
+            # changed or the snapshot would otherwise get too old to restore
+            if (
+                self._snapshot_dirty
+                or data != self.data
+                or self._snapshot_saved_at is None
+                or now - self._snapshot_saved_at >= SNAPSHOT_MAX_AGE / 2
+            ):
+                self._async_save_snapshot(now)
+            self._async_prefetch_wotd(data.wotd)
+            return data
 
+        except ConfigEntryAuthFailed:
+            raise
         except Exception as err:
+            if self.data is not None and self.client.breaker.is_open:
+                _LOGGER.warning(
+                    "Xert API unavailable, serving last good data: %s", err
+                )
+                return self.data
             raise UpdateFailed(f"Error communicating with Xert API: {err}") from err
 
+    def _next_update_interval(self) -> timedelta:
+        """Return the delay until the next poll.
+
+        New activities only show up in the activity list, so once the riding
+        pattern is learned the list follows the adaptive interval as well.
+        """
+        interval = self.polling.interval(dt_util.utcnow())
+        default = ENDPOINT_REFRESH_INTERVALS[ENDPOINT_ACTIVITY_LIST]
+        self._endpoints[ENDPOINT_ACTIVITY_LIST].interval = (
+            min(default, interval) if self.polling.learned else default
+        )
+        if not self._phase_applied:
+            # Shift the polling schedule once by the phase offset of this account
+            self._phase_applied = True
+            return interval + self._phase_offset
+        return interval
+
+    async def _refresh_endpoint(self, endpoint: str, now: datetime) -> None:
+        """Fetch a single endpoint and store the result in its cache."""
+        cache = self._endpoints[endpoint]
+        try:
+            cache.data = await self._fetchers[endpoint]()
+            cache.fetched_at = now
+            cache.stale = False
+        except UpdateFailed as err:
+            # Keep serving the cached result while it is within its budget
+            if not cache.is_fresh(now):
+                raise
+            _LOGGER.warning(
+                "Failed to refresh %s, using cached data from %s: %s",
+                endpoint,
+                cache.fetched_at.isoformat(),
+                err,
+            )
+
+    async def async_request_full_refresh(self) -> None:
+        """Request a refresh of every endpoint regardless of its schedule."""
+        self._force_full_refresh = True
+        await self.async_request_refresh()
+
+    def endpoint_schedule(self) -> dict[str, dict[str, Any]]:
+        """Return the refresh schedule of each endpoint for diagnostics."""
+        return {
+            endpoint: {
+                "interval": str(cache.interval),
+                "stale": cache.stale,
+                "max_age": str(cache.max_age),
+                "fetched_at": cache.fetched_at.isoformat()
+                if cache.fetched_at
+                else None,
+            }
+            for endpoint, cache in self._endpoints.items()
+        }
+
+    async def async_restore_snapshot(self) -> bool:
+        """Restore the last processed data saved to disk.
+
+        Returns True if a compatible and recent snapshot was applied.
+        """
+        try:
+            snapshot = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Failed to load Xert snapshot: %s", err)
+            return False
+
+        if not snapshot or not snapshot.get("data"):
+            return False
+
+        if snapshot.get("version") != SNAPSHOT_VERSION:
+            _LOGGER.debug(
+                "Discarding Xert snapshot with version %s", snapshot.get("version")
+            )
+            return False
+
+        saved_at = dt_util.parse_datetime(snapshot.get("saved_at") or "")
+        if saved_at is None or dt_util.utcnow() - saved_at > SNAPSHOT_MAX_AGE:
+            _LOGGER.debug("Discarding Xert snapshot saved at %s", saved_at)
+            return False
+
+        try:
+            self.data = XertData.from_dict(snapshot["data"])
+        except (KeyError, TypeError) as err:
+            _LOGGER.debug("Discarding malformed Xert snapshot: %s", err)
+            return False
+        self._power_curve = self.data.power_curve
+        self._power_model = self.data.power_model
+        self._training_load = self.data.training_load
+
+        self._activity_history = snapshot.get("activity_history") or []
+        self._activity_high_water = snapshot.get("activity_high_water")
+        self._learn_riding_pattern()
+        if not self._token_expires and snapshot.get("token_expires_at"):
+            self._token_expires = dt_util.parse_datetime(snapshot["token_expires_at"])
+        self._snapshot_saved_at = saved_at
+
+        _LOGGER.debug("Restored Xert snapshot saved at %s", saved_at.isoformat())
+        return True
+
+    @callback
+    def _async_save_snapshot(self, now: datetime) -> None:
+        """Schedule saving the snapshot."""
+        self._snapshot_dirty = False
+        self._snapshot_saved_at = now
+        self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+    def _snapshot(self) -> dict[str, Any]:
+        """Return the data to save in the snapshot store."""
+        return {
+            "version": SNAPSHOT_VERSION,
+            "saved_at": dt_util.utcnow().isoformat(),
+            "token_expires_at": self._token_expires.isoformat()
+            if self._token_expires
+            else None,
+            "activity_high_water": self._activity_high_water,
+            "activity_history": self._activity_history,
+            "data": self.data.as_dict() if self.data else None,
+        }
+
     async def _ensure_valid_token(self) -> None:
         """Ensure we have a valid access token."""
         if not self._token_expires:
@@ -103,93 +470,152 @@ class XertDataUpdateCoordinator(DataUpdateCoordinator):
             await self._refresh_access_token()
             return
         
-        # Refresh proactively 1 hour before expiry to avoid edge cases
-        refresh_threshold = self._token_expires - timedelta(hours=1)
+        # Tokens are refreshed ahead of expiry in the background, only refresh
+        # here if that did not happen in time
+        refresh_threshold = self._token_expires - TOKEN_EXPIRY_MARGIN
         
         if dt_util.utcnow() >= refresh_threshold:
             await self._refresh_access_token()
 
-    async def _refresh_access_token(self) -> None:
-        """Refresh the access token with proper locking and persistence."""
+    @callback
+    def async_schedule_token_refresh(self, delay: timedelta | None = None) -> None:
+        """Schedule the next background token refresh.
+
+        Without a delay, the refresh is scheduled ahead of the token expiry
+        with some jitter so that accounts do not refresh at the same time.
+        """
+        if self._unsub_token_refresh:
+            self._unsub_token_refresh()
+            self._unsub_token_refresh = None
+        if self._unloaded:
+            # A refresh still running at unload must not arm the timer again
+            return
+
+        if delay is None:
+            if self._token_expires is None:
+                delay = timedelta()
+            else:
+                refresh_at = (
+                    self._token_expires
+                    - TOKEN_REFRESH_LEAD
+                    - random.random() * TOKEN_REFRESH_JITTER
+                )
+                delay = max(refresh_at - dt_util.utcnow(), timedelta())
+
+        _LOGGER.debug("Next background token refresh in %s", delay)
+        self._unsub_token_refresh = async_call_later(
+            self.hass, delay, self._async_handle_token_refresh_timer
+        )
+
+    async def _async_handle_token_refresh_timer(self, _now: datetime) -> None:
+        """Refresh the access token in the background."""
+        self._unsub_token_refresh = None
+        try:
+            # A successful refresh schedules the next one
+            await self._refresh_access_token()
+        except ConfigEntryAuthFailed:
+            self.config_entry.async_start_reauth(self.hass)
+        except UpdateFailed as err:
+            _LOGGER.warning(
+                "Background token refresh failed, retrying in %s: %s",
+                TOKEN_REFRESH_RETRY,
+                err,
+            )
+            self.async_schedule_token_refresh(TOKEN_REFRESH_RETRY)
+
+    async def async_unload(self) -> None:
+        """Stop background work when the config entry is unloaded."""
+        self._unloaded = True
+        if self._unsub_token_refresh:
+            self._unsub_token_refresh()
+            self._unsub_token_refresh = None
+        self.client.async_shutdown()
+        self.executor.async_shutdown()
+
+    async def _refresh_access_token(self, rejected_token: str | None = None) -> None:
+        """Refresh the access token, sharing one refresh between all callers.
+
+        If rejected_token is given and the access token has already been
+        replaced since, the new token is used without refreshing again.
+        """
+        if rejected_token is not None and rejected_token != self._access_token:
+            return
+
         if not self._refresh_token:
             raise ConfigEntryAuthFailed("No refresh token available")
 
-        # Use lock to prevent concurrent refresh attempts
-        async with self._refresh_lock:
-            # Check if another task already refreshed while we were waiting
-            if self._is_refreshing:
-                return
-            
-            self._is_refreshing = True
-            
-            try:
-                data = {
-                    "grant_type": "refresh_token",
-                    "refresh_token": self._refresh_token,
-                }
-
-                _LOGGER.debug("Attempting to refresh access token")
-                
-                async with self.session.post(
-                    TOKEN_URL,
-                    data=data,
-                    auth=aiohttp.BasicAuth(OAUTH_CLIENT_ID, OAUTH_CLIENT_SECRET),
-                ) as response:
-                    response_text = await response.text()
-                    
-                    if response.status == 400:
-                        _LOGGER.error("Token refresh failed with 400: %s", response_text)
-                        raise ConfigEntryAuthFailed(
-                            "Token refresh failed: Invalid or expired refresh token. "
-                            "Please re-authenticate."
-                        )
-                    
-                    if response.status == 401:
-                        _LOGGER.error("Token refresh failed with 401: %s", response_text)
-                        raise ConfigEntryAuthFailed(
-                            "Token refresh failed: Unauthorized. Please re-authenticate."
-                        )
-                    
-                    if response.status != 200:
-                        _LOGGER.error(
-                            "Token refresh failed with status %s: %s",
-                            response.status,
-                            response_text,
-                        )
-                        raise UpdateFailed(
-                            f"Token refresh failed with status {response.status}"
-                        )
-
-                    token_data = await response.json()
-                    
-                    # Update tokens in memory
-                    self._access_token = token_data["access_token"]
-                    self._refresh_token = token_data.get(
-                        "refresh_token", self._refresh_token
-                    )
-                    self._token_expires = dt_util.utcnow() + timedelta(
-                        seconds=token_data["expires_in"]
-                    )
-                    
-                    _LOGGER.info(
-                        "Successfully refreshed access token, expires at %s",
-                        self._token_expires.isoformat(),
-                    )
-                    
-                    # Persist tokens to config entry
-                    await self._persist_tokens()
+        if self._refresh_task is None:
+            self._refresh_task = self.hass.async_create_task(
+                self._async_refresh_access_token()
+            )
 
-            except ConfigEntryAuthFailed:
-                # Re-raise auth errors to trigger reauth flow
-                raise
-            except aiohttp.ClientError as err:
-                _LOGGER.error("Network error during token refresh: %s", err)
-                raise UpdateFailed(f"Network error during token refresh: {err}") from err
-            except Exception as err:
-                _LOGGER.error("Unexpected error during token refresh: %s", err)
-                raise UpdateFailed(f"Token refresh error: {err}") from err
-            finally:
-                self._is_refreshing = False
+        # Shield the refresh so that a cancelled caller does not cancel it for
+        # the other callers waiting on the same refresh
+        await asyncio.shield(self._refresh_task)
+
+    async def _async_refresh_rejected_token(self, rejected_token: str | None) -> None:
+        """Refresh a token rejected by the API on behalf of the API client.
+
+        Callers of the client only handle XertApiError, so refresh failures
+        are mapped to it.
+        """
+        try:
+            await self._refresh_access_token(rejected_token)
+        except ConfigEntryAuthFailed as err:
+            raise XertTokenRefreshError(str(err)) from err
+        except UpdateFailed as err:
+            raise XertApiError(str(err)) from err
+
+    @property
+    def token_refresh_in_progress(self) -> bool:
+        """Return True if the access token is being refreshed."""
+        return self._refresh_task is not None
+
+    async def _async_refresh_access_token(self) -> None:
+        """Refresh the access token and persist the new tokens."""
+        try:
+            data = {
+                "grant_type": "refresh_token",
+                "refresh_token": self._refresh_token,
+            }
+
+            _LOGGER.debug("Attempting to refresh access token")
+
+            token_data = await async_request_token(self.session, data)
+
+            # Update tokens in memory
+            self._access_token = token_data["access_token"]
+            self._refresh_token = token_data.get(
+                "refresh_token", self._refresh_token
+            )
+            self._token_expires = dt_util.utcnow() + timedelta(
+                seconds=token_data["expires_in"]
+            )
+
+            _LOGGER.info(
+                "Successfully refreshed access token, expires at %s",
+                self._token_expires.isoformat(),
+            )
+
+            # Persist tokens to config entry
+            await self._persist_tokens()
+            self.async_schedule_token_refresh()
+
+        except XertAuthError as err:
+            # Raise auth errors as ConfigEntryAuthFailed to trigger reauth flow
+            _LOGGER.error("Token refresh failed: %s", err)
+            raise ConfigEntryAuthFailed(
+                "Token refresh failed: Invalid or expired refresh token. "
+                "Please re-authenticate."
+            ) from err
+        except XertApiError as err:
+            _LOGGER.error("Token refresh failed: %s", err)
+            raise UpdateFailed(f"Token refresh failed: {err}") from err
+        except Exception as err:
+            _LOGGER.error("Unexpected error during token refresh: %s", err)
+            raise UpdateFailed(f"Token refresh error: {err}") from err
+        finally:
+            self._refresh_task = None
 
     async def _persist_tokens(self) -> None:
         """Persist updated tokens to config entry."""
@@ -215,123 +641,466 @@ class XertDataUpdateCoordinator(DataUpdateCoordinator):
 
     async def _make_api_request(self, endpoint: str, params: dict = None) -> dict:
         """Make an authenticated API request."""
-        headers = {"Authorization": f"Bearer {self._access_token}"}
-        url = f"{API_BASE_URL}/{endpoint}"
-
         try:
-            async with self.session.get(url, headers=headers, params=params) as response:
-                if response.status == 401:
-                    # Token might be expired, try to refresh
-                    await self._refresh_access_token()
-                    headers["Authorization"] = f"Bearer {self._access_token}"
-                    async with self.session.get(url, headers=headers, params=params) as retry_response:
-                        retry_response.raise_for_status()
-                        return await retry_response.json()
-                else:
-                    response.raise_for_status()
-                    return await response.json()
-
-        except aiohttp.ClientError as err:
-            raise UpdateFailed(f"API request failed: {err}") from err
+            return await self.client.async_get_json(endpoint, params)
+        except XertTokenRefreshError as err:
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except XertApiError as err:
+            raise UpdateFailed(str(err)) from err
 
     async def _fetch_training_info(self) -> dict:
         """Fetch training and fitness information."""
         return await self._make_api_request(ENDPOINT_TRAINING_INFO)
 
     async def _fetch_workouts(self) -> dict:
-        """Fetch available workouts."""
-        return await self._make_api_request(ENDPOINT_WORKOUTS)
+        """Fetch available workouts.
+
+        The workout library can be large, so the list is parsed while it
+        streams in and reduced to compact records.
+        """
+        try:
+            workouts = await self.client.async_get_list(
+                ENDPOINT_WORKOUTS, "workouts", WorkoutRecord.from_api
+            )
+        except XertTokenRefreshError as err:
+            raise ConfigEntryAuthFailed(str(err)) from err
+        except XertApiError as err:
+            raise UpdateFailed(str(err)) from err
+        if workouts.get("success"):
+            added, updated, removed = self.workout_library.sync(workouts["workouts"])
+            _LOGGER.debug(
+                "Synced workout library: %d added, %d updated, %d removed",
+                added,
+                updated,
+                removed,
+            )
+        return workouts
 
     async def _fetch_recent_activities(self) -> dict:
-        """Fetch recent activities."""
-        # Get activities from last 30 days
+        """Fetch new activities and merge them into the local history."""
+        to_date = dt_util.utcnow()
+        reconcile = (
+            self._activity_high_water is None
+            or self._activity_reconciled_at is None
+            or to_date - self._activity_reconciled_at >= ACTIVITY_RECONCILE_INTERVAL
+        )
+        if reconcile:
+            # First sync or daily reconciliation, get the initial sync window
+            from_ts = int((to_date - ACTIVITY_INITIAL_SYNC).timestamp())
+        else:
+            # Only ask for activities after the newest one already seen
+            from_ts = self._activity_high_water - int(
+                ACTIVITY_SYNC_OVERLAP.total_seconds()
+            )
+        # Round the end of the window up to the minute so that concurrent
+        # callers send identical requests that can share one response
+        params = {
+            "from": from_ts,
+            "to": -(-int(to_date.timestamp()) // 60) * 60,
+        }
+        activities = await self._make_api_request(ENDPOINT_ACTIVITY_LIST, params)
+        if not activities.get("success"):
+            return activities
+
+        self._merge_activities(
+            activities.get("activities", []),
+            (params["from"], params["to"]) if reconcile else None,
+        )
+        if reconcile:
+            self._activity_reconciled_at = to_date
+        self._async_sync_activity_details()
+        return {**activities, "activities": self._activity_history}
+
+    def _merge_activities(
+        self, activities: list[dict], window: tuple[int, int] | None = None
+    ) -> None:
+        """Merge fetched activities into the history, newest first.
+
+        If window is given, the activities are the complete list of the
+        activities starting within it, so activities of the history in the
+        window that were not returned have been deleted on Xert.
+        """
+        history = {
+            _activity_key(activity): activity for activity in self._activity_history
+        }
+        if window is not None:
+            fetched = {_activity_key(activity) for activity in activities}
+            for key, activity in list(history.items()):
+                start = activity_timestamp(activity)
+                if (
+                    key not in fetched
+                    and start is not None
+                    and window[0] <= start <= window[1]
+                ):
+                    del history[key]
+                    if activity.get("path"):
+                        self._removed_activities.add(activity["path"])
+        elif not activities:
+            return
+        for activity in activities:
+            history[_activity_key(activity)] = activity
+
+        merged = sorted(
+            history.values(),
+            key=lambda activity: activity_timestamp(activity) or 0,
+            reverse=True,
+        )
+        del merged[ACTIVITY_HISTORY_MAX:]
+        if merged != self._activity_history:
+            self._activity_history = merged
+            self._snapshot_dirty = True
+
+        newest = activity_timestamp(merged[0]) if merged else None
+        if (
+            newest is not None
+            and self._activity_high_water is not None
+            and newest > self._activity_high_water
+        ):
+            # A new ride: watch closely and refresh the training info,
+            # which Xert updates with the new activity
+            self.polling.activity_seen(dt_util.utcnow())
+            self._endpoints[ENDPOINT_TRAINING_INFO].stale = True
+        if window is not None:
+            # The newest activity may have been deleted
+            self._activity_high_water = newest
+        elif newest is not None:
+            self._activity_high_water = max(newest, self._activity_high_water or 0)
+        self._learn_riding_pattern()
+
+    def _learn_riding_pattern(self) -> None:
+        """Update the polling schedule from the activity history."""
+        self.polling.learn(
+            (activity_timestamp(activity) for activity in self._activity_history),
+            dt_util.utcnow(),
+        )
+
+    @property
+    def activity_cache(self) -> ActivityDetailCache:
+        """Return the activity detail cache of this account."""
+        return async_get_activity_cache(self.hass, self.config_entry.entry_id)
+
+    @property
+    def stream_store(self) -> ActivityStreamStore:
+        """Return the activity stream store of this account."""
+        return async_get_stream_store(self.hass, self.config_entry.entry_id)
+
+    @property
+    def activity_history(self) -> list[dict]:
+        """Return the locally kept activity history, newest first."""
+        return self._activity_history
+
+    @callback
+    def _async_sync_activity_details(self) -> None:
+        """Download the details of new activities in the background."""
+        if self._detail_task is not None and not self._detail_task.done():
+            return
+
+        self._detail_task = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_fetch_activity_details(),
+            f"{DOMAIN}_activity_details_{self.config_entry.entry_id}",
+        )
+
+    async def _async_fetch_activity_details(self) -> None:
+        """Download the details of new activities and update the analyses."""
+        try:
+            if self._removed_activities:
+                removed, self._removed_activities = self._removed_activities, set()
+                _LOGGER.debug("Removing %d deleted activities", len(removed))
+                await self.power_curves.async_remove(removed)
+                await self.training_load.async_remove(removed)
+            backfill = await self._async_fetch_statistics_backfill()
+            activity_paths = [
+                activity["path"]
+                for activity in self._activity_history
+                if activity.get("path")
+            ]
+            cache = self.activity_cache
+            now = dt_util.utcnow()
+            missing = [
+                activity_path
+                for activity_path in await cache.async_missing(activity_paths)
+                if activity_path not in self._detail_retries
+                or self._detail_retries[activity_path][1] <= now
+            ]
+            if missing:
+                _LOGGER.debug("Fetching the details of %d activities", len(missing))
+                semaphore = asyncio.Semaphore(ACTIVITY_DETAIL_PARALLELISM)
+
+                async def _fetch(activity_path: str) -> None:
+                    async with semaphore:
+                        try:
+                            await self.async_get_activity_detail(activity_path)
+                        except (XertCircuitOpenError, XertExecutorShutdown):
+                            # Not a failure of this activity, try again after
+                            # the next activity sync
+                            return
+                        except (XertApiError, OSError) as err:
+                            self._detail_failed(activity_path, err)
+                        else:
+                            self._detail_retries.pop(activity_path, None)
+
+                await asyncio.gather(*(_fetch(path) for path in missing))
+
+            await self._async_update_power_curve(activity_paths)
+            await self._async_update_training_load()
+            await self._async_update_statistics(backfill)
+        except XertExecutorShutdown:
+            _LOGGER.debug("Stopped updating the analyses, the entry was unloaded")
+        finally:
+            self._detail_task = None
+
+    def _detail_failed(self, activity_path: str, err: Exception) -> None:
+        """Back off from an activity detail that failed to download."""
+        delay = ACTIVITY_DETAIL_RETRY_DELAY
+        if activity_path in self._detail_retries:
+            delay = min(
+                self._detail_retries[activity_path][0] * 2,
+                ACTIVITY_DETAIL_MAX_RETRY_DELAY,
+            )
+        self._detail_retries[activity_path] = (delay, dt_util.utcnow() + delay)
+        _LOGGER.debug(
+            "Failed to fetch activity %s, retrying in %s: %s",
+            activity_path,
+            delay,
+            err,
+        )
+
+    def _activity_starts(self) -> list[tuple[str, int | None]]:
+        """Return the path and start time of the activities in the history."""
+        return [
+            (activity["path"], activity_timestamp(activity))
+            for activity in self._activity_history
+            if activity.get("path")
+        ]
+
+    async def _async_fetch_statistics_backfill(self) -> bool:
+        """Fetch the activities of the statistics backfill window once.
+
+        Returns True if the statistics should be backfilled on this run.
+        """
+        await self.statistics.async_load()
+        if self.statistics.backfilled or not self.statistics.available:
+            return False
+
         to_date = dt_util.utcnow()
-        from_date = to_date - timedelta(days=30)
         params = {
-            "from": int(from_date.timestamp()),
+            "from": int((to_date - STATISTICS_BACKFILL).timestamp()),
             "to": int(to_date.timestamp()),
         }
-        return await self._make_api_request(ENDPOINT_ACTIVITY_LIST, params)
+        try:
+            activities = await self._make_api_request(ENDPOINT_ACTIVITY_LIST, params)
+        except (ConfigEntryAuthFailed, UpdateFailed) as err:
+            # Authentication failures are handled by the next coordinator update
+            _LOGGER.debug("Failed to fetch the activities to backfill: %s", err)
+            return False
+        if not activities.get("success"):
+            return False
+        self._merge_activities(activities.get("activities", []))
+        if self._snapshot_dirty:
+            self._async_save_snapshot(to_date)
+        return True
+
+    async def _async_update_statistics(self, backfill: bool) -> None:
+        """Write the training load and activity signatures to the statistics."""
+        if not self.statistics.available:
+            return
+        try:
+            await self.statistics.async_record_activities(
+                self._activity_starts(), self.activity_cache.async_load
+            )
+            if backfill or self._training_load is not self._recorded_training_load:
+                history = await self.executor.async_run(
+                    training_load_history, self.training_load.ledger(), dt_util.utcnow()
+                )
+                # After the backfill only recent days can change
+                self.statistics.async_record_training_load(
+                    *history, None if backfill else TRAINING_LOAD_HISTORY_DAYS
+                )
+                self._recorded_training_load = self._training_load
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Failed to update the statistics: %s", err)
+            return
+
+        if backfill:
+            self.statistics.async_set_backfilled()
+
+    async def _async_update_power_curve(self, activity_paths: list[str]) -> None:
+        """Add new activities to the power curves and refit the power model."""
+        try:
+            await self.power_curves.async_update(activity_paths)
+            power_curve = await self.executor.async_run(
+                self.power_curves.summary, int(dt_util.utcnow().timestamp())
+            )
+            if not self.power_model.is_current(power_curve):
+                await self.executor.async_run(self.power_model.fit, power_curve)
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Failed to update the power curves: %s", err)
+            return
 
-    def _process_fitness_status(self, training_info: dict) -> dict:
+        if power_curve == self._power_curve:
+            return
+        self._power_curve = power_curve
+        if self.data is not None:
+            self.data = replace(
+                self.data,
+                power_curve=power_curve,
+                power_model=self._process_power_model(
+                    self.data.training_progress.signature
+                ),
+            )
+            self.async_update_listeners()
+
+    async def _async_update_training_load(self) -> None:
+        """Add new activities to the training load and publish the result."""
+        try:
+            await self.training_load.async_update(
+                self._activity_starts(), self.activity_cache.async_load
+            )
+            training_load, _ = await self.executor.async_run(
+                training_load_summary, self.training_load.ledger(), dt_util.utcnow()
+            )
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Failed to update the training load: %s", err)
+            return
+
+        if training_load == self._training_load:
+            return
+        self._training_load = training_load
+        if self.data is not None:
+            self.data = replace(self.data, training_load=training_load)
+            self.async_update_listeners()
+
+    async def async_forecast_training_load(
+        self, planned: dict[int, float], days: int
+    ) -> list[dict[str, Any]]:
+        """Project the training load with planned XSS per day from today.
+
+        Raises XertExecutorShutdown, a HomeAssistantError the service call
+        reports, if the entry is being unloaded.
+        """
+        await self.training_load.async_load()
+        _, start = await self.executor.async_run(
+            training_load_summary, self.training_load.ledger(), dt_util.utcnow()
+        )
+        return training_load_forecast(start, planned, days)
+
+    async def async_get_activity_detail(self, activity_path: str) -> dict | None:
+        """Return the detail of an activity, downloading it once if needed.
+
+        The sample streams are moved to the activity stream store, the
+        returned detail only holds the remaining data. Returns None if Xert
+        has no detail for the activity.
+        """
+        cache = self.activity_cache
+        if (detail := await cache.async_load(activity_path)) is not None:
+            return detail
+
+        try:
+            detail = await self.client.async_get_json(
+                f"{ENDPOINT_ACTIVITY_DETAIL}/{activity_path}",
+                {"include_session_data": 1},
+                ACTIVITY_DETAIL_TIMEOUT,
+            )
+        except XertRequestRejectedError as err:
+            _LOGGER.debug("Xert rejected the detail of %s: %s", activity_path, err)
+            detail = {}
+        if not detail.get("success"):
+            # Do not request it again
+            await cache.async_save_unavailable(activity_path)
+            return None
+
+        return await self._async_store_activity_detail(activity_path, detail)
+
+    async def _async_store_activity_detail(
+        self, activity_path: str, detail: dict
+    ) -> dict:
+        """Store the streams of an activity and cache the rest of its detail."""
+        # The detail may be shared with other callers, do not modify it
+        detail = dict(detail)
+        if samples := detail.pop("session_data", None):
+            start = activity_timestamp(detail)
+            if start is None:
+                start = next(
+                    (
+                        activity_timestamp(activity)
+                        for activity in self._activity_history
+                        if activity.get("path") == activity_path
+                    ),
+                    None,
+                )
+            streams = await self.executor.async_run(streams_from_samples, samples)
+            await self.stream_store.async_add(activity_path, start, streams)
+        await self.activity_cache.async_save(activity_path, detail)
+        return detail
+
+    def _process_fitness_status(self, training_info: dict) -> FitnessStatus:
         """Process fitness status data based on actual API response."""
         if not training_info.get("success"):
-            return {"state": "Unknown", "attributes": {}}
+            return FitnessStatus()
 
-        # Only keep status as state, and minimal unique attributes if available
-        return {
-            "state": training_info.get("status", "Unknown"),
-            "attributes": {},
-        }
+        # Only keep status as state
+        return FitnessStatus(status=training_info.get("status", "Unknown"))
 
-    def _process_training_progress(self, training_info: dict, activities: dict) -> dict:
+    def _process_training_progress(
+        self, training_info: dict, activities: dict
+    ) -> TrainingProgress:
         """Process training progress data."""
         if not training_info.get("success"):
-            return {"state": 0, "attributes": {}}
+            return TrainingProgress()
 
         signature = training_info.get("signature", {})
         tl = training_info.get("tl", {})
         target_xss = training_info.get("targetXSS", {})
-        attrs = {
-            "weight": training_info.get("weight"),
-            "signature_ftp": signature.get("ftp"),
-            "signature_ltp": signature.get("ltp"),
-            "signature_hie": signature.get("hie"),
-            "signature_pp": signature.get("pp"),
-            "tl_low": tl.get("low"),
-            "tl_high": tl.get("high"),
-            "tl_peak": tl.get("peak"),
-            "tl_total": tl.get("total"),
-            "target_xss_low": target_xss.get("low"),
-            "target_xss_high": target_xss.get("high"),
-            "target_xss_peak": target_xss.get("peak"),
-            "target_xss_total": target_xss.get("total"),
-            "source": training_info.get("source"),
-            "success": training_info.get("success"),
-        }
-        return {
-            "state": 0,
-            "attributes": attrs,
-        }
+        return TrainingProgress(
+            weight=training_info.get("weight"),
+            signature=Signature(
+                ftp=signature.get("ftp"),
+                ltp=signature.get("ltp"),
+                hie=signature.get("hie"),
+                pp=signature.get("pp"),
+            ),
+            tl=_xss_breakdown(tl),
+            target_xss=_xss_breakdown(target_xss),
+            source=training_info.get("source"),
+            success=training_info.get("success"),
+        )
 
-    def _process_workout_manager(self, workouts: dict) -> dict:
+    def _process_workout_manager(self, workouts: dict) -> WorkoutSummary:
         """Process workout manager data."""
         if not workouts.get("success"):
-            return {"state": 0, "attributes": {}}
+            return WorkoutSummary()
 
         workout_list = workouts.get("workouts", [])
-        return {
-            "state": len(workout_list),
-            "attributes": {
-                "total_workouts": len(workout_list),
-                "last_modified": self._get_last_workout_date(workout_list),
-                "sample_workouts": [w.get("name") for w in workout_list[:3]],
-            },
-        }
+        return WorkoutSummary(
+            total_workouts=len(workout_list),
+            last_modified=self._get_last_workout_date(workout_list),
+            sample_workouts=tuple(record.name for record in workout_list[:3]),
+            has_data=True,
+        )
 
-    def _process_recent_activity(self, activities: dict) -> dict:
+    def _process_recent_activity(self, activities: dict) -> RecentActivity:
         """Process recent activity data."""
         if not activities.get("success"):
-            return {"state": "No recent activity", "attributes": {}}
+            return RecentActivity()
 
         activity_list = activities.get("activities", [])
         recent = activity_list[0] if activity_list else {}
         start_date = recent.get("start_date", {})
 
-        return {
-            "state": recent.get("name", "No recent activity"),
-            "attributes": {
-                "activity_type": recent.get("activity_type"),
-                # Flattened start date attributes
-                "activity_date": start_date.get("date"),
-                "activity_timezone": start_date.get("timezone"),
-                "activity_timestamp": start_date.get("timestamp"),
-                "description": recent.get("description"),
-                "path": recent.get("path"),
-            },
-        }
+        return RecentActivity(
+            name=recent.get("name", "No recent activity"),
+            activity_type=recent.get("activity_type"),
+            # Flattened start date attributes
+            activity_date=start_date.get("date"),
+            activity_timezone=start_date.get("timezone"),
+            activity_timestamp=start_date.get("timestamp"),
+            description=recent.get("description"),
+            path=recent.get("path"),
+            has_data=True,
+        )
 
-    def _process_token_status(self) -> dict:
+    def _process_token_status(self) -> TokenStatus:
         """Process token status data."""
         status = "Valid"
         if not self._access_token:
@@ -339,14 +1108,11 @@ class XertDataUpdateCoordinator(DataUpdateCoordinator):
         elif self._token_expires and dt_util.utcnow() >= self._token_expires:
             status = "Expired"
 
-        return {
-            "state": status,
-            "attributes": {
-                "token_expiry": self._token_expires.isoformat() if self._token_expires else None,
-                "refresh_token_available": bool(self._refresh_token),
-                "last_successful_call": dt_util.utcnow().isoformat(),
-            },
-        }
+        return TokenStatus(
+            status=status,
+            token_expiry=self._token_expires.isoformat() if self._token_expires else None,
+            refresh_token_available=bool(self._refresh_token),
+        )
 
     def _get_last_activity_date(self, activities: dict) -> str | None:
         """Get the date of the most recent activity."""
@@ -356,48 +1122,158 @@ class XertDataUpdateCoordinator(DataUpdateCoordinator):
             return start_date.get("date")
         return None
 
-    def _get_last_workout_date(self, workouts: list) -> str | None:
+    def _get_last_workout_date(self, workouts: list[WorkoutRecord]) -> str | None:
         """Get the date of the last modified workout."""
         if workouts:
             # Convert timestamp to date string
-            timestamp = workouts[0].get("last_modified")
+            timestamp = workouts[0].last_modified
             if timestamp:
                 return datetime.fromtimestamp(timestamp).isoformat()
         return None
 
-    def _process_wotd(self, training_info: dict) -> dict:
+    def _process_power_model(self, signature: Signature) -> PowerModel:
+        """Process the locally fitted power model against the signature."""
+        if self.power_model.is_current(self._power_curve):
+            self._power_model = power_model(self.power_model.last_fit, signature)
+        return self._power_model
+
+    def _process_wotd(self, training_info: dict) -> WorkoutOfTheDay:
         """Process Workout of the Day (WOTD) data."""
         wotd = training_info.get("wotd", {})
         if not wotd:
-            return {"state": None, "attributes": {}}
-        return {
-            "state": wotd.get("name"),
-            "attributes": {
-                "type": wotd.get("type"),
-                "description": wotd.get("description"),
-                "workout_id": wotd.get("workoutId"),
-                "url": wotd.get("url"),
-                "difficulty": wotd.get("difficulty"),
-            },
-        }
+            return WorkoutOfTheDay()
+        return WorkoutOfTheDay(
+            name=wotd.get("name"),
+            type=wotd.get("type"),
+            description=wotd.get("description"),
+            workout_id=wotd.get("workoutId"),
+            url=wotd.get("url"),
+            difficulty=wotd.get("difficulty"),
+            xss=wotd.get("xss"),
+            has_data=True,
+        )
 
-    async def download_workout(self, workout_id: str, format_type: str = "zwo") -> bytes:
-        """Download a workout file in specified format."""
-        url = f"https://www.xertonline.com/oauth/workout-download/{workout_id}.{format_type}"
-        headers = {"Authorization": f"Bearer {self._access_token}"}
-        
+    async def async_download_workout(
+        self, workout_id: str, format_type: str, directory: Path
+    ) -> WorkoutFile:
+        """Save a workout file in the specified format to a directory."""
+        cache_path, cached = await self.async_get_workout_file(workout_id, format_type)
+        path = directory / f"{workout_id}.{format_type}"
+        size, sha256 = await async_copy_file(self.hass, cache_path, path)
+        return WorkoutFile(
+            workout_id=workout_id,
+            format=format_type,
+            path=str(path),
+            size=size,
+            sha256=sha256,
+            cached=cached,
+        )
+
+    @callback
+    def _async_prefetch_wotd(self, wotd: WorkoutOfTheDay) -> None:
+        """Warm the workout file cache when the workout of the day changes."""
+        workout_id = wotd.workout_id
+        if (
+            not workout_id
+            or workout_id == self._prefetched_wotd
+            or (self._prefetch_task is not None and not self._prefetch_task.done())
+        ):
+            return
+
+        self._prefetch_task = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_prefetch_workout(workout_id),
+            f"{DOMAIN}_prefetch_wotd_{self.config_entry.entry_id}",
+        )
+
+    async def _async_prefetch_workout(self, workout_id: str) -> None:
+        """Download the files of a workout into the cache."""
         try:
-            async with self.session.get(url, headers=headers) as response:
-                if response.status == 401:
-                    # Token expired, refresh and retry
-                    await self._refresh_access_token()
-                    headers["Authorization"] = f"Bearer {self._access_token}"
-                    async with self.session.get(url, headers=headers) as retry_response:
-                        retry_response.raise_for_status()
-                        return await retry_response.read()
+            for format_type in WORKOUT_FORMATS:
+                await self.async_get_workout_file(workout_id, format_type)
+        except (XertApiError, OSError) as err:
+            # Try again after the next update
+            _LOGGER.warning("Failed to prefetch workout %s: %s", workout_id, err)
+        else:
+            _LOGGER.debug("Prefetched workout of the day %s", workout_id)
+            self._prefetched_wotd = workout_id
+        finally:
+            self._prefetch_task = None
+
+    def find_workouts(self, name: str | None = None) -> list[WorkoutRecord]:
+        """Return the workouts in the library whose name matches name."""
+        return self.workout_library.search(query=name)
+
+    async def async_download_workouts(
+        self,
+        workout_ids: list[str],
+        format_type: str,
+        directory: Path,
+        parallelism: int,
+        progress_callback: Callable[[int, int, dict[str, Any]], None] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Save several workout files concurrently.
+
+        Returns one result per workout, in the order of workout_ids. The
+        progress callback is called with the number of finished downloads,
+        the total and the result of each download as it finishes.
+        """
+        semaphore = asyncio.Semaphore(parallelism)
+        total = len(workout_ids)
+        finished = 0
+
+        async def _download(workout_id: str) -> dict[str, Any]:
+            nonlocal finished
+            async with semaphore:
+                try:
+                    workout_file = await self.async_download_workout(
+                        workout_id, format_type, directory
+                    )
+                except (XertApiError, OSError) as err:
+                    result = {
+                        "workout_id": workout_id,
+                        "success": False,
+                        "error": str(err),
+                    }
                 else:
-                    response.raise_for_status()
-                    return await response.read()
-        except Exception as err:
+                    result = {"success": True, **workout_file.as_dict()}
+
+            finished += 1
+            if progress_callback is not None:
+                progress_callback(finished, total, result)
+            return result
+
+        return await asyncio.gather(
+            *(_download(workout_id) for workout_id in workout_ids)
+        )
+
+    async def async_get_workout_file(
+        self, workout_id: str, format_type: str
+    ) -> tuple[Path, bool]:
+        """Return the cached file of a workout, downloading it if needed.
+
+        Returns the path of the file in the cache and whether it was already
+        cached.
+        """
+        cache = async_get_workout_cache(self.hass, self.config_entry.entry_id)
+        record = self.workout_library.get(workout_id)
+        key = cache.key(
+            workout_id, format_type, record.last_modified if record else None
+        )
+        if (path := await cache.async_lookup(key, format_type)) is not None:
+            _LOGGER.debug("Using cached %s file of workout %s", format_type, workout_id)
+            return path, True
+
+        url = f"{WORKOUT_DOWNLOAD_URL}/{workout_id}.{format_type}"
+        path = cache.path(key, format_type)
+
+        async def _write(response: aiohttp.ClientResponse) -> Path:
+            await async_write_response(self.hass, response, path)
+            await cache.async_add(path)
+            return path
+
+        try:
+            return await self.client.async_download(url, _write, key=key), False
+        except XertApiError as err:
             _LOGGER.error("Failed to download workout %s: %s", workout_id, err)
-            raise
\ No newline at end of file
+            raise
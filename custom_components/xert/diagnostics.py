@@ -36,29 +36,61 @@ async def async_get_config_entry_diagnostics(
             else None
         ),
         "update_interval": str(coordinator.update_interval),
-        "is_refreshing": coordinator._is_refreshing,
+        "polling": coordinator.polling.as_dict(),
+        "last_successful_call": (
+            coordinator.last_successful_call.isoformat()
+            if coordinator.last_successful_call
+            else None
+        ),
+        "is_refreshing": coordinator.token_refresh_in_progress,
+        "endpoints": coordinator.endpoint_schedule(),
+        "circuit_breaker": coordinator.client.breaker.as_dict(),
+        "scheduler": coordinator.scheduler.as_dict(),
+        "workout_library": coordinator.workout_library.as_dict(),
+        "statistics": coordinator.statistics.as_dict(),
     }
     
     # Include current data (non-sensitive)
     current_data = {}
     if coordinator.data:
+        data = coordinator.data
         current_data = {
-            "fitness_status": coordinator.data.get("fitness_status", {}),
+            "fitness_status": {
+                "state": data.fitness_status.state,
+                "attributes": data.fitness_status.attributes,
+            },
             "training_progress": {
-                "state": coordinator.data.get("training_progress", {}).get("state"),
-                "has_attributes": bool(
-                    coordinator.data.get("training_progress", {}).get("attributes")
-                ),
+                "state": data.training_progress.state,
+                "has_attributes": bool(data.training_progress.attributes),
+            },
+            "workout_manager": {
+                "state": data.workout_manager.state,
+                "attributes": data.workout_manager.attributes,
             },
-            "workout_manager": coordinator.data.get("workout_manager", {}),
             "recent_activity": {
-                "state": coordinator.data.get("recent_activity", {}).get("state"),
-                "has_attributes": bool(
-                    coordinator.data.get("recent_activity", {}).get("attributes")
-                ),
+                "state": data.recent_activity.state,
+                "has_attributes": bool(data.recent_activity.attributes),
+            },
+            "token_status": {
+                "state": data.token_status.state,
+                "attributes": data.token_status.attributes,
+            },
+            "wotd": {
+                "state": data.wotd.state,
+                "attributes": data.wotd.attributes,
+            },
+            "power_curve": {
+                "state": data.power_curve.state,
+                "activities": data.power_curve.activities,
+            },
+            "power_model": {
+                "state": data.power_model.state,
+                "attributes": data.power_model.attributes,
+            },
+            "training_load": {
+                "state": data.training_load.state,
+                "activities": data.training_load.activities,
             },
-            "token_status": coordinator.data.get("token_status", {}),
-            "wotd": coordinator.data.get("wotd", {}),
         }
     
     return {
@@ -0,0 +1,66 @@
+"""Offloading of CPU-heavy Xert processing to worker threads."""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import EXECUTOR_CONCURRENCY
+
+_T = TypeVar("_T")
+
+
+class XertExecutorShutdown(HomeAssistantError):
+    """The executor of the account has been shut down."""
+
+
+class XertExecutor:
+    """Runs the CPU-heavy work of one account in the executor.
+
+    At most EXECUTOR_CONCURRENCY jobs of an account run at the same time, so
+    one account cannot occupy the worker threads that the rest of Home
+    Assistant shares. After shutdown no new job starts, queued jobs are
+    cancelled and long running jobs can stop early by checking cancelled.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the executor."""
+        self.hass = hass
+        self.cancelled = threading.Event()
+        self._semaphore = asyncio.Semaphore(EXECUTOR_CONCURRENCY)
+        self._pending: set[asyncio.Future] = set()
+
+    async def async_run(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run target in a worker thread and return its result.
+
+        Raises XertExecutorShutdown if the executor has been shut down.
+        """
+        async with self._semaphore:
+            if self.cancelled.is_set():
+                raise XertExecutorShutdown("Xert executor has been shut down")
+            future = self.hass.async_add_executor_job(target, *args)
+            self._pending.add(future)
+            try:
+                return await future
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if future.cancelled() and task is not None and not task.cancelling():
+                    # The job was cancelled by async_shutdown, not the caller
+                    raise XertExecutorShutdown(
+                        "Xert executor has been shut down"
+                    ) from None
+                raise
+            finally:
+                self._pending.discard(future)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the pending jobs and refuse new ones."""
+        self.cancelled.set()
+        for future in self._pending:
+            future.cancel()
+        self._pending.clear()
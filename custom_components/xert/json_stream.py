@@ -0,0 +1,144 @@
+"""Incremental JSON parsing of Xert list responses."""
+from __future__ import annotations
+
+import codecs
+import json
+import re
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+# Whitespace and separators between members and array elements
+_SKIP = re.compile(r"[ \t\n\r,]*")
+_NUMBER_END = frozenset(" \t\n\r,]}")
+
+_START = 0
+_MEMBER = 1
+_COLON = 2
+_VALUE = 3
+_ARRAY = 4
+_DONE = 5
+
+
+class JsonListStreamParser(Generic[_T]):
+    """Incremental parser for a JSON object holding one large array.
+
+    The response body is fed in chunks. Members of the top-level object are
+    decoded as usual, except for the list member, whose elements are decoded
+    one at a time and converted with item_factory. Neither the raw text nor
+    the decoded elements of the whole array are ever held in memory at once.
+    """
+
+    def __init__(self, list_key: str, item_factory: Callable[[Any], _T]) -> None:
+        """Initialize the parser."""
+        self._list_key = list_key
+        self._item_factory = item_factory
+        self._json = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._state = _START
+        self._key: str | None = None
+        self._members: dict[str, Any] = {}
+        self._items: list[_T] = []
+
+    def feed(self, chunk: bytes) -> None:
+        """Parse the next chunk of the body."""
+        self._buffer = self._buffer[self._pos :] + self._text.decode(chunk)
+        self._pos = 0
+        self._parse(final=False)
+
+    def close(self) -> dict[str, Any]:
+        """Finish parsing and return the top-level members and list items.
+
+        Raises ValueError if the body is not a complete JSON object.
+        """
+        self._buffer = self._buffer[self._pos :] + self._text.decode(b"", final=True)
+        self._pos = 0
+        self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON document")
+        return {**self._members, self._list_key: self._items}
+
+    def _parse(self, final: bool) -> None:
+        """Consume as much of the buffer as possible."""
+        buffer = self._buffer
+        while self._state != _DONE:
+            self._pos = _SKIP.match(buffer, self._pos).end()
+            if self._pos >= len(buffer):
+                return
+            char = buffer[self._pos]
+
+            if self._state == _START:
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                self._pos += 1
+                self._state = _MEMBER
+
+            elif self._state == _MEMBER:
+                if char == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                    return
+                if char != '"':
+                    raise ValueError("Expected an object key")
+                key = self._decode(final)
+                if key is _INCOMPLETE:
+                    return
+                self._key = key
+                self._state = _COLON
+
+            elif self._state == _COLON:
+                if char != ":":
+                    raise ValueError("Expected ':' after object key")
+                self._pos += 1
+                self._state = _VALUE
+
+            elif self._state == _VALUE:
+                if self._key == self._list_key and char == "[":
+                    self._pos += 1
+                    self._state = _ARRAY
+                    continue
+                value = self._decode(final)
+                if value is _INCOMPLETE:
+                    return
+                self._members[self._key] = value
+                self._state = _MEMBER
+
+            elif self._state == _ARRAY:
+                if char == "]":
+                    self._pos += 1
+                    self._state = _MEMBER
+                    continue
+                item = self._decode(final)
+                if item is _INCOMPLETE:
+                    return
+                self._items.append(self._item_factory(item))
+
+    def _decode(self, final: bool) -> Any:
+        """Decode the JSON value at the current position.
+
+        Returns _INCOMPLETE if more data is needed. A number might be cut
+        short by the end of the buffer ("1." decodes as 1), so it is only
+        accepted once the character following it has arrived and ends it.
+        """
+        try:
+            value, end = self._json.raw_decode(self._buffer, self._pos)
+        except json.JSONDecodeError:
+            if final:
+                raise
+            return _INCOMPLETE
+        if not final and (
+            end >= len(self._buffer)
+            or (
+                isinstance(value, (int, float))
+                and self._buffer[end] not in _NUMBER_END
+            )
+        ):
+            return _INCOMPLETE
+        self._pos = end
+        return value
+
+
+_INCOMPLETE: Any = object()
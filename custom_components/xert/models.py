@@ -0,0 +1,439 @@
+"""Data models for processed Xert data."""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+def _number(value: Any) -> float | None:
+    """Return value as a float, or None if it is not a number."""
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
+class FitnessStatus:
+    """Fitness status of the athlete."""
+
+    status: str = "Unknown"
+
+    @property
+    def state(self) -> str:
+        """Return the sensor state."""
+        return self.status
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        return {}
+
+
+@dataclass(frozen=True, slots=True)
+class Signature:
+    """Fitness signature reported by Xert."""
+
+    ftp: float | None = None
+    ltp: float | None = None
+    hie: float | None = None
+    pp: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class XssBreakdown:
+    """XSS values split by low, high and peak intensity."""
+
+    low: float | None = None
+    high: float | None = None
+    peak: float | None = None
+    total: float | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class TrainingProgress:
+    """Signature, training load and target XSS of the athlete."""
+
+    weight: float | None = None
+    signature: Signature = field(default_factory=Signature)
+    tl: XssBreakdown = field(default_factory=XssBreakdown)
+    target_xss: XssBreakdown = field(default_factory=XssBreakdown)
+    source: str | None = None
+    success: bool | None = None
+
+    @property
+    def state(self) -> int:
+        """Return the sensor state."""
+        return 0
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        if self.success is None:
+            return {}
+        return {
+            "weight": self.weight,
+            "signature_ftp": self.signature.ftp,
+            "signature_ltp": self.signature.ltp,
+            "signature_hie": self.signature.hie,
+            "signature_pp": self.signature.pp,
+            "tl_low": self.tl.low,
+            "tl_high": self.tl.high,
+            "tl_peak": self.tl.peak,
+            "tl_total": self.tl.total,
+            "target_xss_low": self.target_xss.low,
+            "target_xss_high": self.target_xss.high,
+            "target_xss_peak": self.target_xss.peak,
+            "target_xss_total": self.target_xss.total,
+            "source": self.source,
+            "success": self.success,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TrainingProgress:
+        """Create from a dict produced by asdict."""
+        return cls(
+            weight=data.get("weight"),
+            signature=Signature(**data.get("signature", {})),
+            tl=XssBreakdown(**data.get("tl", {})),
+            target_xss=XssBreakdown(**data.get("target_xss", {})),
+            source=data.get("source"),
+            success=data.get("success"),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WorkoutSummary:
+    """Summary of the athlete's workout library."""
+
+    total_workouts: int = 0
+    last_modified: str | None = None
+    sample_workouts: tuple[str | None, ...] = ()
+    has_data: bool = False
+
+    @property
+    def state(self) -> int:
+        """Return the sensor state."""
+        return self.total_workouts
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        if not self.has_data:
+            return {}
+        return {
+            "total_workouts": self.total_workouts,
+            "last_modified": self.last_modified,
+            "sample_workouts": list(self.sample_workouts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> WorkoutSummary:
+        """Create from a dict produced by asdict."""
+        return cls(**{**data, "sample_workouts": tuple(data.get("sample_workouts", ()))})
+
+
+@dataclass(frozen=True, slots=True)
+class RecentActivity:
+    """Most recent activity of the athlete."""
+
+    name: str = "No recent activity"
+    activity_type: str | None = None
+    activity_date: str | None = None
+    activity_timezone: str | None = None
+    activity_timestamp: int | None = None
+    description: str | None = None
+    path: str | None = None
+    has_data: bool = False
+
+    @property
+    def state(self) -> str:
+        """Return the sensor state."""
+        return self.name
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        if not self.has_data:
+            return {}
+        return {
+            "activity_type": self.activity_type,
+            "activity_date": self.activity_date,
+            "activity_timezone": self.activity_timezone,
+            "activity_timestamp": self.activity_timestamp,
+            "description": self.description,
+            "path": self.path,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class WorkoutOfTheDay:
+    """Workout of the day recommended by Xert."""
+
+    name: str | None = None
+    type: str | None = None
+    description: str | None = None
+    workout_id: str | None = None
+    url: str | None = None
+    difficulty: float | None = None
+    xss: float | None = None
+    has_data: bool = False
+
+    @property
+    def state(self) -> str | None:
+        """Return the sensor state."""
+        return self.name
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        if not self.has_data:
+            return {}
+        return {
+            "type": self.type,
+            "description": self.description,
+            "workout_id": self.workout_id,
+            "url": self.url,
+            "difficulty": self.difficulty,
+            "xss": self.xss,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class TokenStatus:
+    """Status of the OAuth tokens."""
+
+    status: str = "Unknown"
+    token_expiry: str | None = None
+    refresh_token_available: bool = False
+
+    @property
+    def state(self) -> str:
+        """Return the sensor state."""
+        return self.status
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        return {
+            "token_expiry": self.token_expiry,
+            "refresh_token_available": self.refresh_token_available,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class PowerCurve:
+    """Mean-maximal power curves of the athlete's activities."""
+
+    durations: tuple[int, ...] = ()
+    all_time: tuple[float | None, ...] = ()
+    last_90_days: tuple[float | None, ...] = ()
+    last_30_days: tuple[float | None, ...] = ()
+    state_duration: int | None = None
+    activities: int = 0
+    has_data: bool = False
+
+    @property
+    def state(self) -> float | None:
+        """Return the sensor state, the all-time best power of state_duration."""
+        if not self.has_data or self.state_duration not in self.durations:
+            return None
+        return self.all_time[self.durations.index(self.state_duration)]
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        if not self.has_data:
+            return {}
+        return {
+            "activities": self.activities,
+            "durations": list(self.durations),
+            "all_time": list(self.all_time),
+            "last_90_days": list(self.last_90_days),
+            "last_30_days": list(self.last_30_days),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> PowerCurve:
+        """Create from a dict produced by asdict."""
+        return cls(
+            **{
+                **data,
+                "durations": tuple(data.get("durations", ())),
+                "all_time": tuple(data.get("all_time", ())),
+                "last_90_days": tuple(data.get("last_90_days", ())),
+                "last_30_days": tuple(data.get("last_30_days", ())),
+            }
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PowerModel:
+    """Power-duration model fitted locally to the power curves."""
+
+    cp: float | None = None
+    w_prime: float | None = None
+    pmax: float | None = None
+    tau: float | None = None
+    rmse: float | None = None
+    points: int = 0
+    source: str | None = None
+    ftp_residual: float | None = None
+    hie_residual: float | None = None
+    pp_residual: float | None = None
+    has_data: bool = False
+
+    @property
+    def state(self) -> float | None:
+        """Return the sensor state, the fitted critical power."""
+        return self.cp
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        if not self.has_data:
+            return {}
+        return {
+            "w_prime": self.w_prime,
+            "pmax": self.pmax,
+            "tau": self.tau,
+            "rmse": self.rmse,
+            "points": self.points,
+            "source": self.source,
+            "ftp_residual": self.ftp_residual,
+            "hie_residual": self.hie_residual,
+            "pp_residual": self.pp_residual,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class TrainingLoad:
+    """Training load and fatigue computed locally from activity XSS."""
+
+    training_load: float | None = None
+    fatigue: float | None = None
+    form: float | None = None
+    history_xss: tuple[float, ...] = ()
+    history_training_load: tuple[float, ...] = ()
+    history_fatigue: tuple[float, ...] = ()
+    forecast_training_load: tuple[float, ...] = ()
+    forecast_form: tuple[float, ...] = ()
+    activities: int = 0
+    has_data: bool = False
+
+    @property
+    def state(self) -> float | None:
+        """Return the sensor state."""
+        return self.training_load
+
+    @property
+    def attributes(self) -> dict[str, Any]:
+        """Return the sensor attributes."""
+        if not self.has_data:
+            return {}
+        return {
+            "fatigue": self.fatigue,
+            "form": self.form,
+            "activities": self.activities,
+            "history_xss": list(self.history_xss),
+            "history_training_load": list(self.history_training_load),
+            "history_fatigue": list(self.history_fatigue),
+            "forecast_training_load": list(self.forecast_training_load),
+            "forecast_form": list(self.forecast_form),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TrainingLoad:
+        """Create from a dict produced by asdict."""
+        return cls(
+            **{
+                key: tuple(value) if isinstance(value, list) else value
+                for key, value in data.items()
+            }
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class XertData:
+    """Processed data of a single Xert account, one field per sensor."""
+
+    fitness_status: FitnessStatus
+    training_progress: TrainingProgress
+    workout_manager: WorkoutSummary
+    recent_activity: RecentActivity
+    token_status: TokenStatus
+    wotd: WorkoutOfTheDay
+    power_curve: PowerCurve
+    power_model: PowerModel
+    training_load: TrainingLoad
+
+    def sensor_slice(self, key: str) -> Any:
+        """Return the data slice of a sensor.
+
+        Sensors compare slices to skip writing state that did not change.
+        """
+        return getattr(self, key)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the data as a JSON serializable dict."""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> XertData:
+        """Create from a dict produced by as_dict."""
+        return cls(
+            fitness_status=FitnessStatus(**data["fitness_status"]),
+            training_progress=TrainingProgress.from_dict(data["training_progress"]),
+            workout_manager=WorkoutSummary.from_dict(data["workout_manager"]),
+            recent_activity=RecentActivity(**data["recent_activity"]),
+            token_status=TokenStatus(**data["token_status"]),
+            wotd=WorkoutOfTheDay(**data["wotd"]),
+            power_curve=PowerCurve.from_dict(data["power_curve"]),
+            power_model=PowerModel(**data["power_model"]),
+            training_load=TrainingLoad.from_dict(data["training_load"]),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class WorkoutRecord:
+    """Compact record of a workout in the athlete's library."""
+
+    workout_id: str
+    name: str | None = None
+    last_modified: int | None = None
+    workout_type: str | None = None
+    difficulty: float | None = None
+    duration: int | None = None
+
+    @classmethod
+    def from_api(cls, workout: dict[str, Any]) -> WorkoutRecord:
+        """Create from a workout of the workouts endpoint."""
+        duration = _number(workout.get("duration"))
+        return cls(
+            workout_id=str(workout.get("path") or workout.get("_id") or ""),
+            name=workout.get("name"),
+            last_modified=workout.get("last_modified"),
+            workout_type=workout.get("workout_type") or workout.get("type"),
+            difficulty=_number(workout.get("difficulty")),
+            duration=int(duration) if duration is not None else None,
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the workout as service response data."""
+        return asdict(self)
+
+
+@dataclass(frozen=True, slots=True)
+class WorkoutFile:
+    """Workout file written to disk."""
+
+    workout_id: str
+    format: str
+    path: str
+    size: int
+    sha256: str
+    cached: bool = False
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the file details as service response data."""
+        return asdict(self)
@@ -0,0 +1,156 @@
+"""Adaptive polling schedule learned from the athlete's riding pattern."""
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_MAX_POLL_INTERVAL,
+    CONF_MIN_POLL_INTERVAL,
+    DEFAULT_MAX_POLL_INTERVAL,
+    DEFAULT_MIN_POLL_INTERVAL,
+    POLL_ACTIVE_RATE,
+    POLL_BOOST,
+    POLL_MIN_ACTIVITIES,
+    POLL_PROFILE_WEEKS,
+    POLL_UPLOAD_WINDOW_HOURS,
+)
+
+_HOURS_PER_WEEK = 7 * 24
+
+
+def polling_bounds(options: Mapping[str, Any]) -> tuple[timedelta, timedelta]:
+    """Return the minimum and maximum poll interval of config entry options."""
+    return (
+        timedelta(
+            minutes=options.get(CONF_MIN_POLL_INTERVAL, DEFAULT_MIN_POLL_INTERVAL)
+        ),
+        timedelta(
+            minutes=options.get(CONF_MAX_POLL_INTERVAL, DEFAULT_MAX_POLL_INTERVAL)
+        ),
+    )
+
+
+def _hour_of_week(moment: datetime) -> int:
+    """Return the local hour of the week of a moment, 0 is Monday midnight."""
+    local = dt_util.as_local(moment)
+    return local.weekday() * 24 + local.hour
+
+
+class PollingSchedule:
+    """Poll interval following when the athlete usually rides and uploads.
+
+    The activity starts of the last weeks are binned by local hour of the
+    week, each activity counting for the hours of a typical ride and upload.
+    An hour is active when activities are expected in it often enough,
+    estimated from the same hour on the same weekday and on any day. Active
+    hours and the time after a new activity is seen poll at the minimum
+    interval, other hours back off up to the maximum interval, waking up for
+    the next active hour. Until enough activities are known the default
+    interval is used.
+
+    Wake-ups are shifted by the phase offset of the account, so accounts
+    waking for the same hour do not all poll on the same grid.
+    """
+
+    def __init__(
+        self,
+        default_interval: timedelta,
+        min_interval: timedelta,
+        max_interval: timedelta,
+        phase_offset: timedelta = timedelta(),
+    ) -> None:
+        """Initialize the schedule."""
+        self._default = default_interval
+        self._phase_offset = phase_offset
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._active: list[bool] | None = None
+        self._activity_seen_at: datetime | None = None
+
+    @property
+    def learned(self) -> bool:
+        """Return whether enough activities are known to adapt the interval."""
+        return self._active is not None
+
+    def set_bounds(self, min_interval: timedelta, max_interval: timedelta) -> None:
+        """Change the minimum and maximum interval."""
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+    def learn(self, starts: Iterable[int | None], now: datetime) -> None:
+        """Rebuild the active hours from activity start timestamps."""
+        since = now - timedelta(weeks=POLL_PROFILE_WEEKS)
+        moments = [
+            moment
+            for moment in (
+                dt_util.utc_from_timestamp(start) for start in starts if start is not None
+            )
+            if since <= moment <= now
+        ]
+        if len(moments) < POLL_MIN_ACTIVITIES:
+            self._active = None
+            return
+
+        weeks = max((now - min(moments)) / timedelta(weeks=1), 1.0)
+        weekly = [0] * _HOURS_PER_WEEK
+        for moment in moments:
+            first = _hour_of_week(moment)
+            for offset in range(POLL_UPLOAD_WINDOW_HOURS):
+                weekly[(first + offset) % _HOURS_PER_WEEK] += 1
+        daily = [sum(weekly[hour::24]) for hour in range(24)]
+        # Average the weekday estimate with the any-day estimate, so an hour
+        # the athlete often rides is watched on every day
+        self._active = [
+            (weekly[hour] + daily[hour % 24] / 7) / (2 * weeks) >= POLL_ACTIVE_RATE
+            for hour in range(_HOURS_PER_WEEK)
+        ]
+
+    def activity_seen(self, now: datetime) -> None:
+        """Record that a new activity was seen."""
+        self._activity_seen_at = now
+
+    def interval(self, now: datetime) -> timedelta:
+        """Return the delay until the next poll."""
+        if (
+            self._activity_seen_at is not None
+            and now - self._activity_seen_at < POLL_BOOST
+        ):
+            return self.min_interval
+        if self._active is None:
+            return self._clamp(self._default)
+
+        current = _hour_of_week(now)
+        if self._active[current]:
+            return self.min_interval
+
+        # Sleep until the next active hour, within the bounds
+        local = dt_util.as_local(now)
+        next_hour = (
+            local.replace(minute=0, second=0, microsecond=0)
+            + timedelta(hours=1)
+            + self._phase_offset % self.min_interval
+        )
+        for offset in range(1, _HOURS_PER_WEEK):
+            if self._active[(current + offset) % _HOURS_PER_WEEK]:
+                return self._clamp(next_hour + timedelta(hours=offset - 1) - local)
+        return self.max_interval
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the schedule for diagnostics."""
+        return {
+            "learned": self.learned,
+            "active_hours_per_week": sum(self._active) if self._active else 0,
+            "min_interval": str(self.min_interval),
+            "max_interval": str(self.max_interval),
+            "activity_seen_at": self._activity_seen_at.isoformat()
+            if self._activity_seen_at
+            else None,
+        }
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        """Return an interval within the bounds."""
+        return max(self.min_interval, min(interval, self.max_interval))
@@ -0,0 +1,223 @@
+"""Mean-maximal power curves of Xert activities."""
+from __future__ import annotations
+
+import logging
+import threading
+from collections.abc import Iterable
+from typing import Any
+
+import numpy as np
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .activity_streams import ActivityStreamStore, async_get_stream_store
+from .const import (
+    DOMAIN,
+    MMP_DURATIONS,
+    MMP_MAX_SECONDS,
+    POWER_CURVE_SAVE_DELAY,
+    POWER_CURVE_STATE_DURATION,
+    POWER_CURVE_STORAGE_VERSION,
+    POWER_CURVE_WINDOWS,
+)
+from .executor import XertExecutor
+from .models import PowerCurve
+
+_LOGGER = logging.getLogger(__name__)
+
+_DURATIONS = np.asarray(MMP_DURATIONS, dtype=np.int64)
+
+
+def power_curve_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the activity power curves of a config entry."""
+    return Store(hass, POWER_CURVE_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.power_curves")
+
+
+def mmp_curve(
+    time: np.ndarray, power: np.ndarray, durations: np.ndarray = _DURATIONS
+) -> np.ndarray:
+    """Return the best average power of an activity over each duration.
+
+    The samples are placed on a one second grid where gaps count as zero
+    power. Window sums come from one cumulative sum, so every duration costs a
+    single vectorized pass. Durations longer than the activity are NaN.
+    """
+    curve = np.full(len(durations), np.nan)
+    valid = ~np.isnan(time)
+    seconds = np.rint(time[valid]).astype(np.int64)
+    watts = np.nan_to_num(power[valid], nan=0.0)
+    keep = (seconds >= 0) & (seconds < MMP_MAX_SECONDS)
+    seconds, watts = seconds[keep], watts[keep]
+    if not len(seconds):
+        return curve
+
+    grid = np.zeros(seconds.max() + 1)
+    grid[seconds] = watts
+    cumsum = np.concatenate(([0.0], np.cumsum(grid)))
+    for index, duration in enumerate(durations):
+        if duration > len(grid):
+            break
+        curve[index] = (cumsum[duration:] - cumsum[:-duration]).max() / duration
+    return curve
+
+
+def _activity_curves(
+    streams: ActivityStreamStore,
+    activity_paths: list[str],
+    cancelled: threading.Event,
+) -> dict[str, np.ndarray]:
+    """Compute the curves of activities from their stored streams.
+
+    Blocking, must be called from the executor. Stops early once cancelled
+    is set, returning the curves computed so far.
+    """
+    curves = {}
+    for activity_path in activity_paths:
+        if cancelled.is_set():
+            break
+        try:
+            columns = streams.read_columns(activity_path, ("time", "power"))
+        except (OSError, ValueError) as err:
+            _LOGGER.warning("Skipping unreadable streams of %s: %s", activity_path, err)
+            continue
+        if np.isnan(columns["power"]).all():
+            # No power meter, keep an empty curve so it is not read again
+            curves[activity_path] = np.full(len(_DURATIONS), np.nan)
+            continue
+        curves[activity_path] = mmp_curve(columns["time"], columns["power"])
+    return curves
+
+
+def _as_list(curve: np.ndarray) -> list[float | None]:
+    """Return a curve as a JSON serializable list, rounded to a tenth of a watt."""
+    return [None if np.isnan(value) else round(float(value), 1) for value in curve]
+
+
+class PowerCurveTracker:
+    """Power curves of every processed activity of a config entry.
+
+    The curve of each activity is computed once from its streams and saved,
+    so new activities only cost their own curve. The all-time curve is kept
+    up to date with an elementwise maximum; the rolling window curves are
+    the maximum over the saved curves of the activities in the window.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, executor: XertExecutor
+    ) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._executor = executor
+        self._entry_id = entry_id
+        self._store = power_curve_store(hass, entry_id)
+        self._curves: dict[str, tuple[int | None, np.ndarray]] = {}
+        self._all_time = np.full(len(_DURATIONS), np.nan)
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the saved activity curves."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load() or {}
+        if data.get("durations") != list(MMP_DURATIONS):
+            # The duration grid changed, recompute every curve
+            return
+        for activity_path, entry in data.get("activities", {}).items():
+            curve = np.array(entry["curve"], dtype=float)
+            self._curves[activity_path] = (entry["start"], curve)
+            self._all_time = np.fmax(self._all_time, curve)
+
+    async def async_update(self, activity_paths: Iterable[str]) -> bool:
+        """Add the curves of stored activities that are not processed yet.
+
+        Returns True if any curve was added.
+        """
+        await self.async_load()
+        streams = async_get_stream_store(self.hass, self._entry_id)
+        await streams.async_load()
+        new = [
+            activity_path
+            for activity_path in activity_paths
+            if activity_path not in self._curves and activity_path in streams
+        ]
+        if not new:
+            return False
+
+        curves = await self._executor.async_run(
+            _activity_curves, streams, new, self._executor.cancelled
+        )
+        index = streams.activities(paths=curves)
+        for activity_path, curve in curves.items():
+            self._curves[activity_path] = (index[activity_path]["start"], curve)
+            self._all_time = np.fmax(self._all_time, curve)
+
+        _LOGGER.debug("Added the power curves of %d activities", len(curves))
+        self._store.async_delay_save(self._data_to_save, POWER_CURVE_SAVE_DELAY)
+        return True
+
+    async def async_remove(self, activity_paths: Iterable[str]) -> None:
+        """Remove the curves of deleted activities."""
+        await self.async_load()
+        removed = [
+            activity_path
+            for activity_path in activity_paths
+            if self._curves.pop(activity_path, None) is not None
+        ]
+        if not removed:
+            return
+
+        self._all_time = np.fmax.reduce(
+            np.vstack(
+                [np.full(len(_DURATIONS), np.nan)]
+                + [curve for _, curve in self._curves.values()]
+            )
+        )
+        self._store.async_delay_save(self._data_to_save, POWER_CURVE_SAVE_DELAY)
+
+    def summary(self, now: int) -> PowerCurve:
+        """Return the all-time and rolling window curves at now.
+
+        Blocking on large histories, should be called from the executor.
+        """
+        with_power = {
+            activity_path: entry
+            for activity_path, entry in self._curves.items()
+            if not np.isnan(entry[1]).all()
+        }
+        if not with_power:
+            return PowerCurve()
+
+        windows = {}
+        for name, window in POWER_CURVE_WINDOWS.items():
+            since = now - window.total_seconds()
+            curves = [
+                curve
+                for start, curve in with_power.values()
+                if start is not None and start >= since
+            ]
+            windows[name] = (
+                _as_list(np.fmax.reduce(np.vstack(curves)))
+                if curves
+                else [None] * len(_DURATIONS)
+            )
+
+        return PowerCurve(
+            durations=MMP_DURATIONS,
+            all_time=tuple(_as_list(self._all_time)),
+            last_90_days=tuple(windows["last_90_days"]),
+            last_30_days=tuple(windows["last_30_days"]),
+            state_duration=POWER_CURVE_STATE_DURATION,
+            activities=len(with_power),
+            has_data=True,
+        )
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the curves to save."""
+        return {
+            "durations": list(MMP_DURATIONS),
+            "activities": {
+                activity_path: {"start": start, "curve": _as_list(curve)}
+                for activity_path, (start, curve) in self._curves.items()
+            },
+        }
@@ -0,0 +1,175 @@
+"""Local power-duration model fitted to the mean-maximal power curves."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from .const import (
+    POWER_MODEL_MAX_DURATION,
+    POWER_MODEL_MIN_DURATION,
+    POWER_MODEL_MIN_POINTS,
+    POWER_MODEL_TAU_RANGE,
+    POWER_MODEL_TAU_STEPS,
+)
+from .models import PowerCurve, PowerModel, Signature
+
+# Curves to fit, in order of preference
+_FIT_CURVES = ("last_90_days", "all_time")
+
+_TAU_GRID = np.geomspace(*POWER_MODEL_TAU_RANGE, POWER_MODEL_TAU_STEPS)
+
+
+@dataclass(frozen=True, slots=True)
+class PowerModelFit:
+    """Parameters of a fitted three-parameter power-duration model."""
+
+    cp: float
+    w_prime: float
+    pmax: float
+    tau: float
+    rmse: float
+    points: int
+    source: str
+
+
+def fit_power_model(
+    durations: np.ndarray, power: np.ndarray
+) -> tuple[float, float, float, float] | None:
+    """Fit P(t) = CP + W' / (t + tau) to mean-maximal power points.
+
+    For a fixed tau the model is linear in CP and W', so the least squares
+    problems of every tau of the grid are solved at once as a batch of 2x2
+    normal equations and the tau with the smallest error is kept. The peak
+    power follows as Pmax = CP + W' / tau.
+
+    Returns CP (W), W' (J), tau (s) and the RMSE (W), or None if no tau gives
+    a physical fit.
+    """
+    tau = _TAU_GRID[:, None]
+    basis = 1.0 / (durations[None, :] + tau)
+    count = len(durations)
+
+    # Normal equations of [1, 1 / (t + tau)] for every tau at once
+    sum_basis = basis.sum(axis=1)
+    sum_basis_sq = (basis * basis).sum(axis=1)
+    sum_power = power.sum()
+    sum_basis_power = basis @ power
+    det = count * sum_basis_sq - sum_basis * sum_basis
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cp = (sum_basis_sq * sum_power - sum_basis * sum_basis_power) / det
+        w_prime = (count * sum_basis_power - sum_basis * sum_power) / det
+
+    residuals = power[None, :] - (cp[:, None] + w_prime[:, None] * basis)
+    sse = (residuals * residuals).sum(axis=1)
+    sse[~((cp > 0) & (w_prime > 0) & np.isfinite(sse))] = np.inf
+    best = int(np.argmin(sse))
+    if not np.isfinite(sse[best]):
+        return None
+    return (
+        float(cp[best]),
+        float(w_prime[best]),
+        float(_TAU_GRID[best]),
+        float(np.sqrt(sse[best] / count)),
+    )
+
+
+def _fit_points(curve: PowerCurve, name: str) -> tuple[np.ndarray, np.ndarray]:
+    """Return the durations and powers of a curve within the model range."""
+    durations = np.asarray(curve.durations, dtype=float)
+    power = np.array(getattr(curve, name), dtype=float)
+    keep = (
+        ~np.isnan(power)
+        & (durations >= POWER_MODEL_MIN_DURATION)
+        & (durations <= POWER_MODEL_MAX_DURATION)
+    )
+    return durations[keep], power[keep]
+
+
+class PowerModelFitter:
+    """Fits the power-duration model, memoized on the fitted curve.
+
+    The curves only change when activities are added or leave the rolling
+    window, so most calls return the previous fit without any work.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the fitter."""
+        self._key: tuple | None = None
+        self._fit: PowerModelFit | None = None
+
+    def is_current(self, curve: PowerCurve) -> bool:
+        """Return whether the last fit was made for this curve."""
+        return self._key is not None and self._key == self._curve_key(curve)
+
+    @property
+    def last_fit(self) -> PowerModelFit | None:
+        """Return the last fit."""
+        return self._fit
+
+    def fit(self, curve: PowerCurve) -> PowerModelFit | None:
+        """Return the model fitted to the preferred curve with enough points.
+
+        Blocking, should be called from the executor.
+        """
+        key = self._curve_key(curve)
+        if key == self._key:
+            return self._fit
+
+        fit = None
+        if curve.has_data:
+            for name in _FIT_CURVES:
+                durations, power = _fit_points(curve, name)
+                if len(durations) < POWER_MODEL_MIN_POINTS:
+                    continue
+                if (result := fit_power_model(durations, power)) is None:
+                    continue
+                cp, w_prime, tau, rmse = result
+                fit = PowerModelFit(
+                    cp=cp,
+                    w_prime=w_prime,
+                    pmax=cp + w_prime / tau,
+                    tau=tau,
+                    rmse=rmse,
+                    points=len(durations),
+                    source=name,
+                )
+                break
+
+        self._key = key
+        self._fit = fit
+        return fit
+
+    @staticmethod
+    def _curve_key(curve: PowerCurve) -> tuple:
+        """Return the memoization key of a curve."""
+        return (curve.durations, curve.all_time, curve.last_90_days)
+
+
+def power_model(fit: PowerModelFit | None, signature: Signature) -> PowerModel:
+    """Return the model sensor data, with residuals against the Xert signature.
+
+    Residuals are the fitted value minus the signature value; W' is compared
+    with the high intensity energy (HIE) in kJ.
+    """
+    if fit is None:
+        return PowerModel()
+
+    w_prime = fit.w_prime / 1000
+
+    def _residual(fitted: float, reference: float | None) -> float | None:
+        return round(fitted - reference, 1) if reference is not None else None
+
+    return PowerModel(
+        cp=round(fit.cp, 1),
+        w_prime=round(w_prime, 2),
+        pmax=round(fit.pmax, 1),
+        tau=round(fit.tau, 1),
+        rmse=round(fit.rmse, 1),
+        points=fit.points,
+        source=fit.source,
+        ftp_residual=_residual(fit.cp, signature.ftp),
+        hie_residual=_residual(w_prime, signature.hie),
+        pp_residual=_residual(fit.pmax, signature.pp),
+        has_data=True,
+    )
@@ -0,0 +1,129 @@
+"""Request scheduler shared by all Xert accounts."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections.abc import Awaitable, Iterable
+from datetime import timedelta
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    DOWNLOAD_RATE_LIMIT_BURST,
+    DOWNLOAD_RATE_LIMIT_PER_MINUTE,
+    RATE_LIMIT_PER_MINUTE,
+    RATE_LIMIT_BURST,
+    REFRESH_CONCURRENCY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SCHEDULER = f"{DOMAIN}_scheduler"
+
+_T = TypeVar("_T")
+
+
+@callback
+def async_get_scheduler(hass: HomeAssistant) -> XertRequestScheduler:
+    """Return the request scheduler shared by every Xert config entry."""
+    if (scheduler := hass.data.get(DATA_SCHEDULER)) is None:
+        scheduler = hass.data[DATA_SCHEDULER] = XertRequestScheduler()
+    return scheduler
+
+
+class _TokenBucket:
+    """Token bucket handing out requests at a steady rate with bursts."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """Initialize the bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def take(self, now: float) -> float:
+        """Take a token, returning 0 or the seconds to wait for one."""
+        self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class XertRequestScheduler:
+    """Spread the requests of many Xert accounts over time.
+
+    The scheduler gives every account a stable polling phase so accounts do
+    not poll at the same instant, limits the global request rate with a token
+    bucket (paused when the API answers 429) and bounds how many accounts are
+    refreshed at once. File downloads draw from a separate, larger bucket.
+    """
+
+    def __init__(
+        self,
+        rate: float = RATE_LIMIT_PER_MINUTE / 60,
+        burst: int = RATE_LIMIT_BURST,
+        refresh_concurrency: int = REFRESH_CONCURRENCY,
+        download_rate: float = DOWNLOAD_RATE_LIMIT_PER_MINUTE / 60,
+        download_burst: int = DOWNLOAD_RATE_LIMIT_BURST,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._requests = _TokenBucket(rate, burst)
+        self._downloads = _TokenBucket(download_rate, download_burst)
+        self._paused_until = 0.0
+        self._refresh_concurrency = refresh_concurrency
+
+    @staticmethod
+    def phase_offset(entry_id: str, interval: timedelta) -> timedelta:
+        """Return a stable offset within the interval for an account."""
+        seconds = int(interval.total_seconds())
+        if seconds <= 0:
+            return timedelta()
+        digest = hashlib.sha256(entry_id.encode()).digest()
+        return timedelta(seconds=int.from_bytes(digest[:8], "big") % seconds)
+
+    async def async_acquire(self, download: bool = False) -> None:
+        """Wait until a request, or a file download, may be sent."""
+        bucket = self._downloads if download else self._requests
+        async with bucket.lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                if not (wait := bucket.take(now)):
+                    return
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out requests for the given number of seconds."""
+        paused_until = time.monotonic() + seconds
+        if paused_until > self._paused_until:
+            _LOGGER.warning(
+                "Xert API rate limit hit, pausing requests for %d seconds", seconds
+            )
+            self._paused_until = paused_until
+
+    async def async_run_limited(self, jobs: Iterable[Awaitable[_T]]) -> list[_T]:
+        """Run the jobs concurrently, at most refresh_concurrency at a time."""
+        semaphore = asyncio.Semaphore(self._refresh_concurrency)
+
+        async def _run(job: Awaitable[_T]) -> _T:
+            async with semaphore:
+                return await job
+
+        return await asyncio.gather(*(_run(job) for job in jobs))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "tokens": round(self._requests.tokens, 2),
+            "download_tokens": round(self._downloads.tokens, 2),
+            "paused_for": max(0.0, self._paused_until - time.monotonic()),
+        }
@@ -1,11 +1,17 @@
 """Sensor platform for Xert integration."""
 from __future__ import annotations
 
+from collections.abc import Callable
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import UnitOfPower
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
 
@@ -17,8 +23,43 @@ from .const import (
     SENSOR_RECENT_ACTIVITY,
     SENSOR_TOKEN_STATUS,
     SENSOR_WOTD,
+    SENSOR_POWER_CURVE,
+    SENSOR_POWER_MODEL,
+    SENSOR_TRAINING_LOAD,
+    SENSOR_SIGNATURE_FTP,
+    SENSOR_SIGNATURE_LTP,
+    SENSOR_SIGNATURE_HIE,
+    SENSOR_SIGNATURE_PP,
+    SENSOR_TL_LOW,
+    SENSOR_TL_HIGH,
+    SENSOR_TL_PEAK,
+    SENSOR_TL_TOTAL,
+    SENSOR_TARGET_XSS_LOW,
+    SENSOR_TARGET_XSS_HIGH,
+    SENSOR_TARGET_XSS_PEAK,
+    SENSOR_TARGET_XSS_TOTAL,
 )
 from .coordinator import XertDataUpdateCoordinator
+from .models import TrainingProgress
+
+# Numeric training progress values with their own sensor: sensor type, unit
+# and value. Units are None for the dimensionless training load and XSS
+TRAINING_VALUE_SENSORS: tuple[
+    tuple[str, str | None, Callable[[TrainingProgress], Any]], ...
+] = (
+    (SENSOR_SIGNATURE_FTP, UnitOfPower.WATT, lambda progress: progress.signature.ftp),
+    (SENSOR_SIGNATURE_LTP, UnitOfPower.WATT, lambda progress: progress.signature.ltp),
+    (SENSOR_SIGNATURE_HIE, "kJ", lambda progress: progress.signature.hie),
+    (SENSOR_SIGNATURE_PP, UnitOfPower.WATT, lambda progress: progress.signature.pp),
+    (SENSOR_TL_LOW, None, lambda progress: progress.tl.low),
+    (SENSOR_TL_HIGH, None, lambda progress: progress.tl.high),
+    (SENSOR_TL_PEAK, None, lambda progress: progress.tl.peak),
+    (SENSOR_TL_TOTAL, None, lambda progress: progress.tl.total),
+    (SENSOR_TARGET_XSS_LOW, None, lambda progress: progress.target_xss.low),
+    (SENSOR_TARGET_XSS_HIGH, None, lambda progress: progress.target_xss.high),
+    (SENSOR_TARGET_XSS_PEAK, None, lambda progress: progress.target_xss.peak),
+    (SENSOR_TARGET_XSS_TOTAL, None, lambda progress: progress.target_xss.total),
+)
 
 
 async def async_setup_entry(
@@ -37,6 +78,13 @@ async def async_setup_entry(
             XertRecentActivitySensor(coordinator),
             XertTokenStatusSensor(coordinator),
             XertWOTDSensor(coordinator),
+            XertPowerCurveSensor(coordinator),
+            XertPowerModelSensor(coordinator),
+            XertTrainingLoadSensor(coordinator),
+            *(
+                XertTrainingValueSensor(coordinator, sensor_type, unit, value_fn)
+                for sensor_type, unit, value_fn in TRAINING_VALUE_SENSORS
+            ),
         ]
     )
 
@@ -44,10 +92,14 @@ async def async_setup_entry(
 class XertSensor(SensorEntity):
     """Base class for Xert sensors."""
 
+    # State is only written from coordinator updates
+    _attr_should_poll = False
+
     def __init__(self, coordinator: XertDataUpdateCoordinator, sensor_type: str) -> None:
         """Initialize the sensor."""
         self.coordinator = coordinator
         self._sensor_type = sensor_type
+        self._last_written: tuple[bool, Any] | None = None
         self._attr_has_entity_name = True
         self._attr_device_info = {
             "identifiers": {(DOMAIN, coordinator.config_entry.entry_id)},
@@ -64,10 +116,26 @@ class XertSensor(SensorEntity):
     async def async_added_to_hass(self) -> None:
         """When entity is added to hass."""
         await super().async_added_to_hass()
+        self._last_written = self._write_key()
         self.async_on_remove(
-            self.coordinator.async_add_listener(self.async_write_ha_state)
+            self.coordinator.async_add_listener(self._handle_coordinator_update)
         )
 
+    def _write_key(self) -> tuple[bool, Any]:
+        """Return the availability and data slice of this sensor."""
+        if self.coordinator.data is None:
+            return self.available, None
+        return self.available, self.coordinator.data.sensor_slice(self._sensor_type)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when this sensor's data or availability changed."""
+        write_key = self._write_key()
+        if write_key == self._last_written:
+            return
+        self._last_written = write_key
+        self.async_write_ha_state()
+
 
 class XertFitnessStatusSensor(XertSensor):
     """Representation of Xert Fitness Status sensor."""
@@ -82,18 +150,40 @@ class XertFitnessStatusSensor(XertSensor):
     @property
     def state(self) -> StateType:
         """Return the state of the sensor."""
-        data = self.coordinator.data.get("fitness_status", {})
-        return data.get("state", "Unknown")
+        return self.coordinator.data.fitness_status.status
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        data = self.coordinator.data.get("fitness_status", {})
-        return data.get("attributes", {})
+        return self.coordinator.data.fitness_status.attributes
 
 
 class XertTrainingProgressSensor(XertSensor):
-    """Representation of Xert Training Progress sensor."""
+    """Representation of Xert Training Progress sensor.
+
+    Every value also has its own numeric sensor, so the attributes are kept
+    for dashboards but not recorded.
+    """
+
+    _unrecorded_attributes = frozenset(
+        {
+            "weight",
+            "signature_ftp",
+            "signature_ltp",
+            "signature_hie",
+            "signature_pp",
+            "tl_low",
+            "tl_high",
+            "tl_peak",
+            "tl_total",
+            "target_xss_low",
+            "target_xss_high",
+            "target_xss_peak",
+            "target_xss_total",
+            "source",
+            "success",
+        }
+    )
 
     def __init__(self, coordinator: XertDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
@@ -105,19 +195,19 @@ class XertTrainingProgressSensor(XertSensor):
     @property
     def state(self) -> StateType:
         """Return the state of the sensor."""
-        data = self.coordinator.data.get("training_progress", {})
-        return data.get("state", 0)
+        return self.coordinator.data.training_progress.state
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        data = self.coordinator.data.get("training_progress", {})
-        return data.get("attributes", {})
+        return self.coordinator.data.training_progress.attributes
 
 
 class XertWorkoutManagerSensor(XertSensor):
     """Representation of Xert Workout Manager sensor."""
 
+    _unrecorded_attributes = frozenset({"sample_workouts"})
+
     def __init__(self, coordinator: XertDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, SENSOR_WORKOUT_MANAGER)
@@ -128,19 +218,19 @@ class XertWorkoutManagerSensor(XertSensor):
     @property
     def state(self) -> StateType:
         """Return the state of the sensor."""
-        data = self.coordinator.data.get("workout_manager", {})
-        return data.get("state", 0)
+        return self.coordinator.data.workout_manager.total_workouts
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        data = self.coordinator.data.get("workout_manager", {})
-        return data.get("attributes", {})
+        return self.coordinator.data.workout_manager.attributes
 
 
 class XertRecentActivitySensor(XertSensor):
     """Representation of Xert Recent Activity sensor."""
 
+    _unrecorded_attributes = frozenset({"description"})
+
     def __init__(self, coordinator: XertDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, SENSOR_RECENT_ACTIVITY)
@@ -151,14 +241,12 @@ class XertRecentActivitySensor(XertSensor):
     @property
     def state(self) -> StateType:
         """Return the state of the sensor."""
-        data = self.coordinator.data.get("recent_activity", {})
-        return data.get("state", "No recent activity")
+        return self.coordinator.data.recent_activity.name
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        data = self.coordinator.data.get("recent_activity", {})
-        return data.get("attributes", {})
+        return self.coordinator.data.recent_activity.attributes
 
 
 class XertTokenStatusSensor(XertSensor):
@@ -174,19 +262,19 @@ class XertTokenStatusSensor(XertSensor):
     @property
     def state(self) -> StateType:
         """Return the state of the sensor."""
-        data = self.coordinator.data.get("token_status", {})
-        return data.get("state", "Unknown")
+        return self.coordinator.data.token_status.status
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes."""
-        data = self.coordinator.data.get("token_status", {})
-        return data.get("attributes", {})
+        return self.coordinator.data.token_status.attributes
 
 
 class XertWOTDSensor(XertSensor):
     """Representation of Xert Workout of the Day sensor."""
 
+    _unrecorded_attributes = frozenset({"description"})
+
     def __init__(self, coordinator: XertDataUpdateCoordinator) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator, SENSOR_WOTD)
@@ -197,11 +285,132 @@ class XertWOTDSensor(XertSensor):
     @property
     def state(self) -> StateType:
         """Return the state of the sensor (WOTD name)."""
-        data = self.coordinator.data.get("wotd", {})
-        return data.get("state", None)
+        return self.coordinator.data.wotd.name
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return entity specific state attributes for WOTD."""
-        data = self.coordinator.data.get("wotd", {})
-        return data.get("attributes", {}) 
\ No newline at end of file
+        return self.coordinator.data.wotd.attributes 
+
+
+class XertPowerCurveSensor(XertSensor):
+    """Representation of Xert Power Curve sensor."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset(
+        {"durations", "all_time", "last_90_days", "last_30_days"}
+    )
+
+    def __init__(self, coordinator: XertDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, SENSOR_POWER_CURVE)
+        username = self.coordinator.config_data.get("username", "xert")
+        self._attr_name = f"{username}_power_curve"
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{SENSOR_POWER_CURVE}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the all-time best 20 minute power."""
+        return self.coordinator.data.power_curve.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the power curves."""
+        return self.coordinator.data.power_curve.attributes
+
+
+class XertPowerModelSensor(XertSensor):
+    """Representation of Xert Power Model sensor."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: XertDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, SENSOR_POWER_MODEL)
+        username = self.coordinator.config_data.get("username", "xert")
+        self._attr_name = f"{username}_power_model"
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{SENSOR_POWER_MODEL}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the locally fitted critical power."""
+        return self.coordinator.data.power_model.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the fitted model and its residuals against the signature."""
+        return self.coordinator.data.power_model.attributes
+
+
+class XertTrainingLoadSensor(XertSensor):
+    """Representation of Xert Training Load sensor."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset(
+        {
+            "history_xss",
+            "history_training_load",
+            "history_fatigue",
+            "forecast_training_load",
+            "forecast_form",
+        }
+    )
+
+    def __init__(self, coordinator: XertDataUpdateCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, SENSOR_TRAINING_LOAD)
+        username = self.coordinator.config_data.get("username", "xert")
+        self._attr_name = f"{username}_training_load"
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{SENSOR_TRAINING_LOAD}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the locally computed training load."""
+        return self.coordinator.data.training_load.state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return fatigue, form, their history and forecast."""
+        return self.coordinator.data.training_load.attributes
+
+
+class XertTrainingValueSensor(XertSensor):
+    """Numeric sensor of one signature, training load or target XSS value."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: XertDataUpdateCoordinator,
+        sensor_type: str,
+        unit: str | None,
+        value_fn: Callable[[TrainingProgress], Any],
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, sensor_type)
+        self._value_fn = value_fn
+        username = self.coordinator.config_data.get("username", "xert")
+        self._attr_name = f"{username}_{sensor_type}"
+        self._attr_unique_id = f"{coordinator.config_entry.entry_id}_{sensor_type}"
+        self._attr_native_unit_of_measurement = unit
+        if unit == UnitOfPower.WATT:
+            self._attr_device_class = SensorDeviceClass.POWER
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value from the training progress."""
+        value = self._value_fn(self.coordinator.data.training_progress)
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    def _write_key(self) -> tuple[bool, Any]:
+        """Return the availability and value of this sensor."""
+        if self.coordinator.data is None:
+            return self.available, None
+        return self.available, self.native_value
@@ -0,0 +1,255 @@
+"""Long-term statistics of Xert values in the Home Assistant recorder."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import numpy as np
+from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
+from homeassistant.const import UnitOfPower
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import DOMAIN, STATISTICS_SAVE_DELAY, STATISTICS_STORAGE_VERSION
+from .models import TrainingProgress
+
+_LOGGER = logging.getLogger(__name__)
+
+# Recorded statistics by key, with their name and unit
+STATISTICS: dict[str, tuple[str, str | None]] = {
+    "ftp": ("FTP", UnitOfPower.WATT),
+    "ltp": ("LTP", UnitOfPower.WATT),
+    "hie": ("HIE", "kJ"),
+    "pp": ("PP", UnitOfPower.WATT),
+    "tl_low": ("TL low", None),
+    "tl_high": ("TL high", None),
+    "tl_peak": ("TL peak", None),
+    "tl_total": ("TL total", None),
+    "training_load": ("Training load", None),
+    "fatigue": ("Fatigue", None),
+    "form": ("Form", None),
+}
+
+_SIGNATURE_KEYS = ("ftp", "ltp", "hie", "pp")
+
+
+def statistics_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the statistics backfill state of a config entry."""
+    return Store(hass, STATISTICS_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.statistics")
+
+
+def activity_signature(detail: dict[str, Any]) -> dict[str, float]:
+    """Return the signature values recorded with an activity detail.
+
+    Only the signature block of the detail, or of its summary, is read. Other
+    ftp-like fields of the detail are not known to be the signature at the
+    time of the activity.
+    """
+    values = {}
+    for source in (detail.get("summary") or {}, detail):
+        signature = source.get("signature")
+        if not isinstance(signature, dict):
+            continue
+        for key in _SIGNATURE_KEYS:
+            if key in values:
+                continue
+            try:
+                values[key] = float(signature[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return values
+
+
+def _hour(moment: datetime) -> datetime:
+    """Return the start of the UTC hour of a moment."""
+    return dt_util.as_utc(moment).replace(minute=0, second=0, microsecond=0)
+
+
+def _row(start: datetime, value: float) -> StatisticData:
+    """Return an hourly statistics row of a single value."""
+    return StatisticData(start=start, mean=value, min=value, max=value)
+
+
+class XertStatistics:
+    """Writes Xert values as external statistics of the recorder.
+
+    Statistics are hourly rows keyed by their start, so writing a row again
+    replaces it. Live values go to the row of the current hour, the daily
+    training load to the first hour of each day and the signature of an
+    activity to the hour it started. The first run backfills the training
+    load of every synced activity and the signatures found in their details.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, username: str) -> None:
+        """Initialize the statistics."""
+        self.hass = hass
+        self._username = username
+        self._prefix = f"{DOMAIN}:{slugify(username) or entry_id.lower()}"
+        self._store = statistics_store(hass, entry_id)
+        self._written: dict[str, tuple[datetime, float]] = {}
+        self._activities: set[str] = set()
+        self._backfilled = False
+        self._loaded = False
+
+    @property
+    def available(self) -> bool:
+        """Return whether the recorder is running."""
+        return "recorder" in self.hass.config.components
+
+    @property
+    def backfilled(self) -> bool:
+        """Return whether the history has been backfilled."""
+        return self._backfilled
+
+    def statistic_id(self, key: str) -> str:
+        """Return the statistic id of a value."""
+        return f"{self._prefix}_{key}"
+
+    async def async_load(self) -> None:
+        """Load the backfill state."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load() or {}
+        self._backfilled = data.get("backfilled", False)
+        self._activities = set(data.get("activities", []))
+
+    @callback
+    def async_record_training_progress(
+        self, progress: TrainingProgress, now: datetime
+    ) -> None:
+        """Write the current signature and Xert training load."""
+        if not self.available or not progress.success:
+            return
+        hour = _hour(now)
+        values = {
+            "ftp": progress.signature.ftp,
+            "ltp": progress.signature.ltp,
+            "hie": progress.signature.hie,
+            "pp": progress.signature.pp,
+            "tl_low": progress.tl.low,
+            "tl_high": progress.tl.high,
+            "tl_peak": progress.tl.peak,
+            "tl_total": progress.tl.total,
+        }
+        for key, value in values.items():
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                continue
+            if self._written.get(key) == (hour, value):
+                continue
+            self._written[key] = (hour, value)
+            self._async_add(key, [_row(hour, value)])
+
+    @callback
+    def async_record_training_load(
+        self,
+        first_day: date,
+        load: np.ndarray,
+        fatigue: np.ndarray,
+        days: int | None = None,
+    ) -> None:
+        """Write the daily training load, fatigue and form.
+
+        Only the last days are written if given, the whole series otherwise.
+        """
+        if not self.available:
+            return
+        start = 0 if days is None else max(len(load) - days, 0)
+        hours = [
+            _hour(dt_util.start_of_local_day(first_day + timedelta(days=day)))
+            for day in range(start, len(load))
+        ]
+        for key, series in (
+            ("training_load", load[start:]),
+            ("fatigue", fatigue[start:]),
+            ("form", load[start:] - fatigue[start:]),
+        ):
+            self._async_add(
+                key,
+                [
+                    _row(hour, round(float(value), 1))
+                    for hour, value in zip(hours, series)
+                ],
+            )
+
+    async def async_record_activities(
+        self,
+        activities: Iterable[tuple[str, int | None]],
+        load_detail: Callable[[str], Awaitable[dict[str, Any] | None]],
+    ) -> None:
+        """Write the signature of activities that are not recorded yet.
+
+        Activities are (path, start) pairs.
+        """
+        await self.async_load()
+        if not self.available:
+            return
+        # One row per hour, activities starting in the same hour share it
+        rows: dict[str, dict[datetime, StatisticData]] = {}
+        added = 0
+        for activity_path, start in activities:
+            if start is None or activity_path in self._activities:
+                continue
+            if (detail := await load_detail(activity_path)) is None:
+                continue
+            self._activities.add(activity_path)
+            added += 1
+            hour = _hour(dt_util.utc_from_timestamp(start))
+            for key, value in activity_signature(detail).items():
+                rows.setdefault(key, {})[hour] = _row(hour, value)
+
+        for key, key_rows in rows.items():
+            self._async_add(key, [key_rows[hour] for hour in sorted(key_rows)])
+        if added:
+            _LOGGER.debug("Recorded the signatures of %d activities", added)
+            self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+    @callback
+    def async_set_backfilled(self) -> None:
+        """Mark the history as backfilled."""
+        self._backfilled = True
+        self._store.async_delay_save(self._data_to_save, STATISTICS_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the recorded statistics and the backfill state."""
+        if self.available:
+            get_instance(self.hass).async_clear_statistics(
+                [self.statistic_id(key) for key in STATISTICS]
+            )
+        await self._store.async_remove()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state of the statistics for diagnostics."""
+        return {
+            "available": self.available,
+            "backfilled": self._backfilled,
+            "activities": len(self._activities),
+            "statistic_ids": [self.statistic_id(key) for key in STATISTICS],
+        }
+
+    @callback
+    def _async_add(self, key: str, rows: list[StatisticData]) -> None:
+        """Queue rows of a statistic for the recorder."""
+        if not rows:
+            return
+        name, unit = STATISTICS[key]
+        metadata = StatisticMetaData(
+            has_mean=True,
+            has_sum=False,
+            name=f"Xert {self._username} {name}",
+            source=DOMAIN,
+            statistic_id=self.statistic_id(key),
+            unit_of_measurement=unit,
+        )
+        async_add_external_statistics(self.hass, metadata, rows)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the backfill state to save."""
+        return {"backfilled": self._backfilled, "activities": sorted(self._activities)}
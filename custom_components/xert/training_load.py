@@ -0,0 +1,276 @@
+"""Local training load and fatigue history of Xert activities."""
+from __future__ import annotations
+
+import logging
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import numpy as np
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    EWMA_BLOCK_DAYS,
+    FATIGUE_DAYS,
+    TRAINING_LOAD_DAYS,
+    TRAINING_LOAD_FORECAST_DAYS,
+    TRAINING_LOAD_HISTORY_DAYS,
+    TRAINING_LOAD_SAVE_DELAY,
+    TRAINING_LOAD_STORAGE_VERSION,
+)
+from .models import TrainingLoad
+
+_LOGGER = logging.getLogger(__name__)
+
+_XSS_KEYS = ("xss", "XSS", "total_xss")
+
+
+def training_load_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the activity XSS ledger of a config entry."""
+    return Store(
+        hass, TRAINING_LOAD_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.training_load"
+    )
+
+
+def activity_xss(detail: dict[str, Any]) -> float | None:
+    """Return the XSS of an activity detail or list entry."""
+    for source in (detail.get("summary") or {}, detail):
+        for key in _XSS_KEYS:
+            try:
+                return float(source[key])
+            except (KeyError, TypeError, ValueError):
+                continue
+    return None
+
+
+def ewma(
+    values: np.ndarray, days: float, initial: float = 0.0, block: int = EWMA_BLOCK_DAYS
+) -> np.ndarray:
+    """Return the exponentially weighted average of daily values.
+
+    Computes y[t] = a * y[t - 1] + (1 - a) * x[t] with a = exp(-1 / days).
+    Within a block the recurrence has the closed form
+    y[j] = a^(j + 1) * (y0 + (1 - a) * sum(x[k] * a^-(k + 1), k <= j)),
+    a cumulative sum. Blocks are short enough for a^-(k + 1) to stay well
+    within float64 range and carry their last value into the next block.
+    """
+    decay = np.exp(-1.0 / days)
+    result = np.empty(len(values))
+    powers = decay ** np.arange(1, block + 1)
+    state = initial
+    for start in range(0, len(values), block):
+        chunk = values[start : start + block]
+        scale = powers[: len(chunk)]
+        result[start : start + len(chunk)] = scale * (
+            state + (1 - decay) * np.cumsum(chunk / scale)
+        )
+        state = result[start + len(chunk) - 1]
+    return result
+
+
+@dataclass(frozen=True, slots=True)
+class ForecastStart:
+    """Training load and fatigue at the end of yesterday and today's XSS."""
+
+    day: date
+    training_load: float = 0.0
+    fatigue: float = 0.0
+    xss: float = 0.0
+
+
+def _daily_xss(
+    activities: list[tuple[int, float]], now: datetime
+) -> tuple[date, np.ndarray]:
+    """Return today and the XSS of every day from the first activity to today."""
+    today = dt_util.as_local(now).date()
+    if not activities:
+        return today, np.zeros(1)
+
+    days = np.array(
+        [
+            (dt_util.as_local(dt_util.utc_from_timestamp(start)).date() - today).days
+            for start, _ in activities
+        ]
+    )
+    xss = np.array([xss for _, xss in activities])
+    first = int(min(days.min(), 0))
+    daily = np.bincount(days - first, weights=xss, minlength=1 - first)[: 1 - first]
+    return today, daily
+
+
+def _forecast_start(
+    today: date, daily: np.ndarray, load: np.ndarray, fatigue: np.ndarray
+) -> ForecastStart:
+    """Return the start of forecasts from the daily series up to today."""
+    if len(daily) < 2:
+        return ForecastStart(today, xss=float(daily[-1]))
+    return ForecastStart(today, float(load[-2]), float(fatigue[-2]), float(daily[-1]))
+
+
+def training_load_summary(
+    activities: list[tuple[int, float]], now: datetime
+) -> tuple[TrainingLoad, ForecastStart]:
+    """Rebuild the daily series of a ledger up to today.
+
+    Activities are (start, xss) pairs, a copy of the ledger. Returns the
+    sensor data and the start of forecasts. Blocking on long histories,
+    should be called from the executor.
+    """
+    today, daily = _daily_xss(activities, now)
+    load = ewma(daily, TRAINING_LOAD_DAYS)
+    fatigue = ewma(daily, FATIGUE_DAYS)
+    start = _forecast_start(today, daily, load, fatigue)
+    if not activities:
+        return TrainingLoad(), start
+
+    history = slice(-TRAINING_LOAD_HISTORY_DAYS, None)
+    forecast = training_load_forecast(start, {}, TRAINING_LOAD_FORECAST_DAYS)
+    return (
+        TrainingLoad(
+            training_load=round(float(load[-1]), 1),
+            fatigue=round(float(fatigue[-1]), 1),
+            form=round(float(load[-1] - fatigue[-1]), 1),
+            history_xss=tuple(round(float(value), 1) for value in daily[history]),
+            history_training_load=tuple(
+                round(float(value), 1) for value in load[history]
+            ),
+            history_fatigue=tuple(round(float(value), 1) for value in fatigue[history]),
+            forecast_training_load=tuple(day["training_load"] for day in forecast[1:]),
+            forecast_form=tuple(day["form"] for day in forecast[1:]),
+            activities=len(activities),
+            has_data=True,
+        ),
+        start,
+    )
+
+
+def training_load_history(
+    activities: list[tuple[int, float]], now: datetime
+) -> tuple[date, np.ndarray, np.ndarray]:
+    """Return the first day and the daily training load and fatigue up to today.
+
+    Activities are (start, xss) pairs, a copy of the ledger. Blocking on long
+    histories, should be called from the executor.
+    """
+    today, daily = _daily_xss(activities, now)
+    first_day = today - timedelta(days=len(daily) - 1)
+    return first_day, ewma(daily, TRAINING_LOAD_DAYS), ewma(daily, FATIGUE_DAYS)
+
+
+def training_load_forecast(
+    start: ForecastStart, planned: dict[int, float], days: int
+) -> list[dict[str, Any]]:
+    """Project the series from today with planned XSS per day offset.
+
+    Day 0 is today, including the activities already done today.
+    """
+    daily = np.zeros(days + 1)
+    daily[0] = start.xss
+    for offset, xss in planned.items():
+        if 0 <= offset <= days:
+            daily[offset] += xss
+
+    load = ewma(daily, TRAINING_LOAD_DAYS, start.training_load)
+    fatigue = ewma(daily, FATIGUE_DAYS, start.fatigue)
+    return [
+        {
+            "date": (start.day + timedelta(days=offset)).isoformat(),
+            "xss": round(float(daily[offset]), 1),
+            "training_load": round(float(load[offset]), 1),
+            "fatigue": round(float(fatigue[offset]), 1),
+            "form": round(float(load[offset] - fatigue[offset]), 1),
+        }
+        for offset in range(days + 1)
+    ]
+
+
+class TrainingLoadTracker:
+    """Ledger of per-activity XSS the daily training load is rebuilt from.
+
+    The XSS of every activity is read once from its detail and kept in a
+    ledger, so the whole daily history can be recomputed cheaply whenever an
+    activity arrives or the day changes.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the tracker."""
+        self.hass = hass
+        self._store = training_load_store(hass, entry_id)
+        self._activities: dict[str, tuple[int, float]] = {}
+        # Activities whose detail had no XSS, to only warn about them once
+        self._without_xss: set[str] = set()
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the activity ledger."""
+        if self._loaded:
+            return
+        self._loaded = True
+        data = await self._store.async_load() or {}
+        self._activities = {
+            activity_path: (int(start), float(xss))
+            for activity_path, (start, xss) in data.get("activities", {}).items()
+        }
+
+    async def async_update(
+        self,
+        activities: Iterable[tuple[str, int | None]],
+        load_detail: Callable[[str], Awaitable[dict[str, Any] | None]],
+    ) -> bool:
+        """Add the XSS of activities that are not in the ledger yet.
+
+        Activities are (path, start) pairs. Returns True if any was added.
+        """
+        await self.async_load()
+        added = 0
+        for activity_path, start in activities:
+            if start is None or activity_path in self._activities:
+                continue
+            if (detail := await load_detail(activity_path)) is None:
+                continue
+            if (xss := activity_xss(detail)) is None:
+                # Read again on the next run rather than counting it as zero
+                if activity_path not in self._without_xss:
+                    self._without_xss.add(activity_path)
+                    _LOGGER.warning(
+                        "No XSS found in the detail of activity %s", activity_path
+                    )
+                continue
+            self._activities[activity_path] = (start, xss)
+            added += 1
+
+        if added:
+            _LOGGER.debug("Added the XSS of %d activities", added)
+            self._store.async_delay_save(self._data_to_save, TRAINING_LOAD_SAVE_DELAY)
+        return bool(added)
+
+    async def async_remove(self, activity_paths: Iterable[str]) -> None:
+        """Remove deleted activities from the ledger."""
+        await self.async_load()
+        removed = [
+            activity_path
+            for activity_path in activity_paths
+            if self._activities.pop(activity_path, None) is not None
+        ]
+        if removed:
+            self._store.async_delay_save(self._data_to_save, TRAINING_LOAD_SAVE_DELAY)
+
+    def ledger(self) -> list[tuple[int, float]]:
+        """Return a copy of the (start, xss) pairs of the ledger.
+
+        The ledger changes on the event loop, so the executor works on a copy.
+        """
+        return list(self._activities.values())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the ledger to save."""
+        return {
+            "activities": {
+                activity_path: [start, xss]
+                for activity_path, (start, xss) in self._activities.items()
+            }
+        }
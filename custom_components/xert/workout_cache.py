@@ -0,0 +1,150 @@
+"""On-disk cache of downloaded Xert workout files."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+from collections import OrderedDict
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, WORKOUT_CACHE_DIR, WORKOUT_CACHE_MAX_BYTES
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_WORKOUT_CACHE = f"{DOMAIN}_workout_cache"
+
+
+def workout_cache_dir(hass: HomeAssistant, entry_id: str) -> Path:
+    """Return the workout file cache directory of a config entry."""
+    return Path(hass.config.path(WORKOUT_CACHE_DIR, entry_id))
+
+
+@callback
+def async_get_workout_cache(hass: HomeAssistant, entry_id: str) -> WorkoutFileCache:
+    """Return the workout file cache of a config entry.
+
+    Files are only served to the account that downloaded them.
+    """
+    caches = hass.data.setdefault(DATA_WORKOUT_CACHE, {})
+    if (cache := caches.get(entry_id)) is None:
+        cache = caches[entry_id] = WorkoutFileCache(
+            hass, workout_cache_dir(hass, entry_id), WORKOUT_CACHE_MAX_BYTES
+        )
+    return cache
+
+
+async def async_remove_workout_cache(hass: HomeAssistant, entry_id: str) -> None:
+    """Delete the workout file cache of a config entry."""
+    hass.data.get(DATA_WORKOUT_CACHE, {}).pop(entry_id, None)
+    await hass.async_add_executor_job(
+        shutil.rmtree, workout_cache_dir(hass, entry_id), True
+    )
+
+
+class WorkoutFileCache:
+    """Content-addressed workout file cache with LRU eviction.
+
+    Files are named after a hash of the workout id, format and last modified
+    time, so an edited workout gets a new entry and the stale one is evicted
+    once the cache grows past its size cap. The file modification time
+    records the last use, which keeps the LRU order across restarts.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path, max_bytes: int) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self.directory = directory
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, int] | None = None
+        self._size = 0
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def key(workout_id: str, format_type: str, last_modified: int | None) -> str:
+        """Return the cache key of a workout file version.
+
+        Without a last modified time the key changes daily, so unversioned
+        files are downloaded again at most once a day.
+        """
+        version = (
+            str(last_modified)
+            if last_modified is not None
+            else f"day-{dt_util.utcnow().date().isoformat()}"
+        )
+        return hashlib.sha256(
+            f"{workout_id}:{format_type}:{version}".encode()
+        ).hexdigest()
+
+    def path(self, key: str, format_type: str) -> Path:
+        """Return the path of a cache entry."""
+        return self.directory / f"{key}.{format_type}"
+
+    async def async_lookup(self, key: str, format_type: str) -> Path | None:
+        """Return the path of a cached file and mark it as recently used."""
+        await self._async_load()
+        name = self.path(key, format_type).name
+        if name not in self._entries:
+            return None
+
+        self._entries.move_to_end(name)
+        path = self.path(key, format_type)
+        try:
+            await self.hass.async_add_executor_job(os.utime, path)
+        except FileNotFoundError:
+            self._size -= self._entries.pop(name)
+            return None
+        return path
+
+    async def async_add(self, path: Path) -> None:
+        """Register a file written to the cache and evict old entries."""
+        await self._async_load()
+        size = (await self.hass.async_add_executor_job(path.stat)).st_size
+        async with self._lock:
+            self._size += size - self._entries.pop(path.name, 0)
+            self._entries[path.name] = size
+
+            evict = []
+            while self._size > self._max_bytes and len(self._entries) > 1:
+                name, entry_size = self._entries.popitem(last=False)
+                self._size -= entry_size
+                evict.append(self.directory / name)
+
+        if evict:
+            _LOGGER.debug("Evicting %d workout files from the cache", len(evict))
+            await self.hass.async_add_executor_job(_remove_files, evict)
+
+    async def _async_load(self) -> None:
+        """Load the cache index from disk on first use."""
+        if self._entries is not None:
+            return
+        async with self._lock:
+            if self._entries is None:
+                entries = await self.hass.async_add_executor_job(
+                    _scan_directory, self.directory
+                )
+                self._entries = OrderedDict(entries)
+                self._size = sum(self._entries.values())
+
+
+def _scan_directory(directory: Path) -> list[tuple[str, int]]:
+    """Return the cached files, least recently used first."""
+    if not directory.is_dir():
+        return []
+    files = []
+    for path in directory.iterdir():
+        if path.is_file() and not path.name.startswith("."):
+            stat = path.stat()
+            files.append((stat.st_mtime, path.name, stat.st_size))
+    files.sort()
+    return [(name, size) for _, name, size in files]
+
+
+def _remove_files(paths: list[Path]) -> None:
+    """Remove evicted files."""
+    for path in paths:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,100 @@
+"""Workout file storage for the Xert integration."""
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import BinaryIO
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import DOWNLOAD_CHUNK_SIZE
+
+
+def resolve_config_path(hass: HomeAssistant, directory: str) -> Path:
+    """Resolve a directory relative to the config directory.
+
+    Raises HomeAssistantError if the directory is outside the config directory.
+    """
+    config_dir = Path(hass.config.config_dir).resolve()
+    target = (config_dir / directory).resolve()
+    if target != config_dir and config_dir not in target.parents:
+        raise HomeAssistantError(
+            f"Directory {directory} is not inside the configuration directory"
+        )
+    return target
+
+
+async def async_write_response(
+    hass: HomeAssistant, response: aiohttp.ClientResponse, path: Path
+) -> tuple[int, str]:
+    """Stream a response body to a file and return its size and SHA-256.
+
+    The body is written chunk by chunk to a temporary file next to the target,
+    which replaces the target only once the download is complete.
+    """
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    file = await hass.async_add_executor_job(_open_for_write, tmp_path)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+            await hass.async_add_executor_job(file.write, chunk)
+        await hass.async_add_executor_job(_commit, file, tmp_path, path)
+    except BaseException:
+        await hass.async_add_executor_job(_discard, file, tmp_path)
+        raise
+
+    return size, digest.hexdigest()
+
+
+async def async_copy_file(
+    hass: HomeAssistant, source: Path, path: Path
+) -> tuple[int, str]:
+    """Atomically copy a file and return its size and SHA-256."""
+    return await hass.async_add_executor_job(_copy_file, source, path)
+
+
+def _copy_file(source: Path, path: Path) -> tuple[int, str]:
+    """Copy a file through a temporary file, hashing it on the way."""
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    file = _open_for_write(tmp_path)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with source.open("rb") as source_file:
+            while chunk := source_file.read(DOWNLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+                file.write(chunk)
+        _commit(file, tmp_path, path)
+    except BaseException:
+        _discard(file, tmp_path)
+        raise
+
+    return size, digest.hexdigest()
+
+
+def _open_for_write(path: Path) -> BinaryIO:
+    """Open a file for writing, creating its directory."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path.open("wb")
+
+
+def _commit(file: BinaryIO, tmp_path: Path, path: Path) -> None:
+    """Flush a temporary file to disk and move it into place atomically."""
+    file.flush()
+    os.fsync(file.fileno())
+    file.close()
+    os.replace(tmp_path, path)
+
+
+def _discard(file: BinaryIO, tmp_path: Path) -> None:
+    """Close and remove a partially written temporary file."""
+    file.close()
+    tmp_path.unlink(missing_ok=True)
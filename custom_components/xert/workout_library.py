@@ -0,0 +1,218 @@
+"""Indexed in-memory library of an athlete's Xert workouts."""
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import Any
+
+from .models import WorkoutRecord
+
+_TOKEN = re.compile(r"\w+")
+
+# Sort orders of search results, (key, descending)
+WORKOUT_SORT_KEYS = {
+    "name": (lambda record: (record.name or "").casefold(), False),
+    "difficulty": (lambda record: record.difficulty or 0, False),
+    "duration": (lambda record: record.duration or 0, False),
+    "last_modified": (lambda record: record.last_modified or 0, True),
+}
+
+
+def _tokens(text: str | None) -> set[str]:
+    """Return the casefolded word tokens of text."""
+    return set(_TOKEN.findall(text.casefold())) if text else set()
+
+
+class _RangeIndex:
+    """Sorted index of a numeric workout field for range queries."""
+
+    def __init__(self) -> None:
+        """Initialize the index."""
+        self._entries: list[tuple[float, str]] = []
+
+    def add(self, value: float | None, workout_id: str) -> None:
+        """Index the value of a workout."""
+        if value is not None:
+            insort(self._entries, (value, workout_id))
+
+    def remove(self, value: float | None, workout_id: str) -> None:
+        """Remove the value of a workout from the index."""
+        if value is None:
+            return
+        index = bisect_left(self._entries, (value, workout_id))
+        if index < len(self._entries) and self._entries[index] == (value, workout_id):
+            del self._entries[index]
+
+    def highest(self) -> float | None:
+        """Return the highest indexed value."""
+        return self._entries[-1][0] if self._entries else None
+
+    def between(self, low: float | None, high: float | None) -> set[str]:
+        """Return the workouts whose value lies within low and high inclusive."""
+        start = 0 if low is None else bisect_left(self._entries, (low,))
+        end = (
+            len(self._entries)
+            if high is None
+            else bisect_right(self._entries, (high, "\U0010ffff"))
+        )
+        return {workout_id for _, workout_id in self._entries[start:end]}
+
+
+class WorkoutLibrary:
+    """Workout library with indexes on name, type, difficulty, duration and age.
+
+    The library is synced with the full workout list after every refresh of
+    the workouts endpoint. Only workouts that are new, removed or have a new
+    last modified time are reindexed, so a sync of an unchanged library is a
+    single pass over the records.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty library."""
+        self._records: dict[str, WorkoutRecord] = {}
+        self._names: dict[str, set[str]] = defaultdict(set)
+        self._sorted_names: list[str] | None = None
+        self._types: dict[str, set[str]] = defaultdict(set)
+        self._difficulty = _RangeIndex()
+        self._duration = _RangeIndex()
+        self._last_modified = _RangeIndex()
+
+    def __len__(self) -> int:
+        """Return the number of workouts in the library."""
+        return len(self._records)
+
+    def get(self, workout_id: str) -> WorkoutRecord | None:
+        """Return the workout with the given id."""
+        return self._records.get(workout_id)
+
+    @property
+    def last_modified(self) -> int | None:
+        """Return the newest last modified time in the library."""
+        return self._last_modified.highest()
+
+    def sync(self, records: Iterable[WorkoutRecord]) -> tuple[int, int, int]:
+        """Sync the library with the full list of workouts.
+
+        Returns the number of added, updated and removed workouts.
+        """
+        added = updated = 0
+        seen: set[str] = set()
+        for record in records:
+            if not record.workout_id:
+                continue
+            seen.add(record.workout_id)
+            current = self._records.get(record.workout_id)
+            if current is None:
+                added += 1
+            elif current.last_modified == record.last_modified and (
+                record.last_modified is not None or current == record
+            ):
+                continue
+            else:
+                updated += 1
+                self._remove(current)
+            self._add(record)
+
+        removed = [workout_id for workout_id in self._records if workout_id not in seen]
+        for workout_id in removed:
+            self._remove(self._records[workout_id])
+        return added, updated, len(removed)
+
+    def search(
+        self,
+        query: str | None = None,
+        workout_type: str | None = None,
+        min_difficulty: float | None = None,
+        max_difficulty: float | None = None,
+        min_duration: int | None = None,
+        max_duration: int | None = None,
+        modified_since: int | None = None,
+        sort: str = "name",
+    ) -> list[WorkoutRecord]:
+        """Return the workouts matching every given filter.
+
+        Each word of query must be the start of a word in the workout name.
+        """
+        candidates: set[str] | None = None
+
+        def _narrow(matches: set[str]) -> None:
+            nonlocal candidates
+            candidates = matches if candidates is None else candidates & matches
+
+        for token in _tokens(query):
+            _narrow(self._name_matches(token))
+        if workout_type:
+            _narrow(set(self._types.get(workout_type.casefold(), ())))
+        if min_difficulty is not None or max_difficulty is not None:
+            _narrow(self._difficulty.between(min_difficulty, max_difficulty))
+        if min_duration is not None or max_duration is not None:
+            _narrow(self._duration.between(min_duration, max_duration))
+        if modified_since is not None:
+            _narrow(self._last_modified.between(modified_since, None))
+
+        records = (
+            self._records.values()
+            if candidates is None
+            else (self._records[workout_id] for workout_id in candidates)
+        )
+        key, reverse = WORKOUT_SORT_KEYS[sort]
+        return sorted(records, key=key, reverse=reverse)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the library statistics for diagnostics."""
+        return {
+            "workouts": len(self._records),
+            "name_tokens": len(self._names),
+            "types": sorted(self._types),
+            "last_modified": self.last_modified,
+        }
+
+    def _name_matches(self, prefix: str) -> set[str]:
+        """Return the workouts with a name token starting with prefix."""
+        if self._sorted_names is None:
+            self._sorted_names = sorted(self._names)
+        names = self._sorted_names
+        matches: set[str] = set()
+        for index in range(bisect_left(names, prefix), len(names)):
+            if not names[index].startswith(prefix):
+                break
+            matches |= self._names[names[index]]
+        return matches
+
+    def _add(self, record: WorkoutRecord) -> None:
+        """Add a workout to the records and indexes."""
+        workout_id = record.workout_id
+        self._records[workout_id] = record
+        for token in _tokens(record.name):
+            if token not in self._names:
+                self._sorted_names = None
+            self._names[token].add(workout_id)
+        if record.workout_type:
+            self._types[record.workout_type.casefold()].add(workout_id)
+        self._difficulty.add(record.difficulty, workout_id)
+        self._duration.add(record.duration, workout_id)
+        self._last_modified.add(record.last_modified, workout_id)
+
+    def _remove(self, record: WorkoutRecord) -> None:
+        """Remove a workout from the records and indexes."""
+        workout_id = record.workout_id
+        del self._records[workout_id]
+        for token in _tokens(record.name):
+            _discard(self._names, token, workout_id)
+            if token not in self._names:
+                self._sorted_names = None
+        if record.workout_type:
+            _discard(self._types, record.workout_type.casefold(), workout_id)
+        self._difficulty.remove(record.difficulty, workout_id)
+        self._duration.remove(record.duration, workout_id)
+        self._last_modified.remove(record.last_modified, workout_id)
+
+
+def _discard(index: dict[str, set[str]], key: str, workout_id: str) -> None:
+    """Remove a workout from an index entry, dropping the entry once empty."""
+    if (workout_ids := index.get(key)) is not None:
+        workout_ids.discard(workout_id)
+        if not workout_ids:
+            del index[key]